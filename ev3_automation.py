@@ -3,16 +3,79 @@ EV3 Automation Module
 Provides scheduling, sequencing, and conditional automation for EV3 programs
 """
 
+import asyncio
+import contextvars
+import heapq
+import inspect
 import time
 import threading
-import schedule
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Dict, Callable, Optional, Any
+from typing import List, Dict, Callable, NamedTuple, Optional, Any, Tuple
 from ev3_controller import EV3Controller
 
 logger = logging.getLogger(__name__)
 
+# Step kinds - integer compares in the hot loop instead of string compares
+KIND_PROGRAM = 0
+KIND_WAIT = 1
+KIND_SOUND = 2
+KIND_PARALLEL = 3
+
+_KIND_NAMES = ('program', 'wait', 'sound', 'parallel')
+
+
+class ScheduledJob(NamedTuple):
+    """One entry in the scheduler's next-fire queue"""
+    time_str: str
+    repeat: str
+    interval: Optional[float]  # seconds between fires; None for one-shots
+    callback: Callable
+
+
+class Step(NamedTuple):
+    """
+    Fixed-slot description of one sequence step
+
+    A compact tuple instead of a per-step dict: attribute access is an
+    index lookup rather than a string hash, and long sequences stay small
+    in memory.
+    """
+    kind: int
+    handler: Optional[Callable]
+    args: tuple
+    wait: float
+    condition: Optional[str]
+
+@dataclass
+class RunContext:
+    """
+    Mutable state for one run of run_sequence_async
+
+    Kept off the automation instance (and tracked through a ContextVar)
+    so overlapping runs of the same automation never share a condition
+    cache or context dict and need no locking.
+    """
+    controller: EV3Controller
+    cond_cache: Dict[str, Tuple[float, bool]] = field(default_factory=dict)
+    cond_ctx: Dict[str, Any] = field(default_factory=dict)
+
+
+# The RunContext of the run executing in the current task, if any
+_current_run: contextvars.ContextVar[Optional[RunContext]] = contextvars.ContextVar(
+    'ev3_automation_run', default=None)
+
+
+class PlanStep(NamedTuple):
+    """Runtime form of a Step after _compile resolves its condition"""
+    kind: int
+    handler: Optional[Callable]
+    args: tuple
+    wait: float
+    cond: Optional[Callable[[], bool]]
+
+
 class EV3Automation:
     """
     Automation system for EV3 programs
@@ -21,10 +84,42 @@ class EV3Automation:
     
     def __init__(self, controller: Optional[EV3Controller] = None):
         self.controller = controller or EV3Controller()
-        self.sequences: List[Dict[str, Any]] = []
+        # Steps are compiled to Step tuples at append time, with the
+        # controller method bound up front
+        self.sequences: List[Step] = []
+        # Display strings rendered once per append so list_sequence is a
+        # single join/print instead of per-call branching
+        self._pretty_lines: List[str] = []
+        # Runtime plan produced by _compile(), rebuilt lazily after edits
+        self._plan: List[PlanStep] = []
+        self._plan_dirty = True
         self.scheduler_running = False
         self.scheduler_thread: Optional[threading.Thread] = None
+        self.scheduler_task: Optional[asyncio.Task] = None
+        self._stop_event = threading.Event()
+        # Next-fire queue: a heap of (fire_timestamp, counter, job) so the
+        # scheduler dispatches in O(log n) and knows exactly how long to
+        # sleep, instead of scanning every job per tick like the schedule
+        # library. The heap is instance-local, so jobs never cross talk
+        # between automations. Entries are (fire_ts, counter, job) tuples
+        # on purpose: the float-then-int prefix resolves every heap
+        # comparison in C before the job object is ever consulted, and the
+        # counter breaks ties between jobs due at the same instant. Any
+        # future priority queue in this codebase should use the same shape.
+        self._heap: List[Tuple[float, int, ScheduledJob]] = []
+        self._job_counter = 0
+        self._my_jobs: List[ScheduledJob] = []
         self.conditions: Dict[str, Callable] = {}
+        # Per-run memoization of condition results; a condition that may hit
+        # the EV3 over Bluetooth (e.g. battery level) is evaluated once per
+        # run instead of once per step. condition_ttl limits cache age in
+        # seconds; None means results are kept for the whole run.
+        self.condition_ttl: Optional[float] = None
+        self._cond_cache: Dict[str, Tuple[float, bool]] = {}
+        # Shared context dict passed to conditions that accept one; mutated
+        # in place per check instead of allocating a fresh dict each time
+        self._cond_ctx: Dict[str, Any] = {}
+        self._ctx_conditions: set = set()
         
     def add_program_step(self, program_name: str, wait_time: float = 0, 
                         condition: Optional[str] = None) -> 'EV3Automation':
@@ -39,14 +134,10 @@ class EV3Automation:
         Returns:
             Self for method chaining
         """
-        step = {
-            'type': 'program',
-            'program_name': program_name,
-            'wait_time': wait_time,
-            'condition': condition
-        }
-        self.sequences.append(step)
-        logger.info(f"Added program step: {program_name}")
+        self._append_step(Step(
+            KIND_PROGRAM, self.controller.run_program, (program_name,),
+            wait_time, condition))
+        logger.info("Added program step: %s", program_name)
         return self
     
     def add_wait_step(self, duration: float) -> 'EV3Automation':
@@ -59,12 +150,8 @@ class EV3Automation:
         Returns:
             Self for method chaining
         """
-        step = {
-            'type': 'wait',
-            'duration': duration
-        }
-        self.sequences.append(step)
-        logger.info(f"Added wait step: {duration} seconds")
+        self._append_step(Step(KIND_WAIT, None, (), duration, None))
+        logger.info("Added wait step: %s seconds", duration)
         return self
     
     def add_sound_step(self, frequency: int = 440, duration: int = 1000, 
@@ -80,31 +167,218 @@ class EV3Automation:
         Returns:
             Self for method chaining
         """
-        step = {
-            'type': 'sound',
-            'frequency': frequency,
-            'duration': duration,
-            'wait_time': wait_time
-        }
-        self.sequences.append(step)
-        logger.info(f"Added sound step: {frequency}Hz for {duration}ms")
+        self._append_step(Step(
+            KIND_SOUND, self.controller.play_sound, (frequency, duration),
+            wait_time, None))
+        logger.info("Added sound step: %sHz for %sms", frequency, duration)
         return self
     
+    def add_parallel_group(self, automations: List['EV3Automation'],
+                           wait_time: float = 0,
+                           condition: Optional[str] = None) -> 'EV3Automation':
+        """
+        Add a step that runs several automations concurrently
+
+        The sub-automations are awaited together with asyncio.gather, so
+        K independent sequences (e.g. one per EV3 unit) take the duration
+        of the longest one instead of their sum. Each sub-automation should
+        have its own controller, already connected.
+
+        Args:
+            automations: Automations to run concurrently
+            wait_time: Time to wait after the group finishes (seconds)
+            condition: Optional condition name that must be true to execute
+
+        Returns:
+            Self for method chaining
+        """
+        self._append_step(Step(
+            KIND_PARALLEL, None, tuple(automations), wait_time, condition))
+        logger.info("Added parallel group with %d automations", len(automations))
+        return self
+
+    def _append_step(self, step: Step):
+        """Append a step and render its display line once, at add time"""
+        self.sequences.append(step)
+        self._pretty_lines.append(self._format_step(len(self.sequences), step))
+        self._plan_dirty = True
+
+    def _compile(self) -> List[PlanStep]:
+        """
+        Build the runtime step list from self.sequences
+
+        Folds a standalone wait step into the trailing wait of the previous
+        unconditional step (and chains of waits into one), so each pause
+        costs a single sleep/timer entry instead of several. Conditional
+        steps are never merged because their wait is skipped with them.
+
+        Condition names are also resolved here, once per compile: a
+        registered name becomes a direct callable through the per-run
+        cache, and an unregistered name becomes None (one warning here
+        instead of a lookup and a warning on every step).
+        """
+        merged: List[Step] = []
+        for step in self.sequences:
+            if (step.kind == KIND_WAIT and merged
+                    and merged[-1].condition is None):
+                merged[-1] = merged[-1]._replace(wait=merged[-1].wait + step.wait)
+            else:
+                merged.append(step)
+
+        plan: List[PlanStep] = []
+        for step in merged:
+            cond = None
+            if step.condition:
+                if step.condition in self.conditions:
+                    cond = (lambda name=step.condition:
+                            self._check_condition_cached(name))
+                else:
+                    logger.warning(
+                        "Condition '%s' not found; steps referencing it "
+                        "will run unconditionally", step.condition)
+            plan.append(PlanStep(step.kind, step.handler, step.args,
+                                 step.wait, cond))
+        return plan
+
+    @staticmethod
+    def _format_step(number: int, step: Step) -> str:
+        """Render the list_sequence display line for a step"""
+        step_info = f"{number}. {_KIND_NAMES[step.kind].upper()}"
+
+        if step.kind == KIND_PROGRAM:
+            step_info += f": {step.args[0]}"
+            if step.wait:
+                step_info += f" (wait {step.wait}s)"
+            if step.condition:
+                step_info += f" [if {step.condition}]"
+
+        elif step.kind == KIND_WAIT:
+            step_info += f": {step.wait} seconds"
+
+        elif step.kind == KIND_SOUND:
+            step_info += f": {step.args[0]}Hz for {step.args[1]}ms"
+            if step.wait:
+                step_info += f" (wait {step.wait}s)"
+
+        elif step.kind == KIND_PARALLEL:
+            step_info += f": {len(step.args)} automations"
+            if step.wait:
+                step_info += f" (wait {step.wait}s)"
+            if step.condition:
+                step_info += f" [if {step.condition}]"
+
+        return step_info
+
     def add_condition(self, condition_name: str, condition_func: Callable[[], bool]) -> 'EV3Automation':
         """
         Add a condition that can be used in automation steps
-        
+
         Args:
             condition_name: Name to reference the condition
-            condition_func: Function that returns True/False
-        
+            condition_func: Function that returns True/False. It may
+                optionally take a single dict argument to receive run
+                context (step index, current time); the dict is shared
+                and mutated in place between checks, so callbacks must
+                not retain a reference to it.
+
         Returns:
             Self for method chaining
         """
         self.conditions[condition_name] = condition_func
-        logger.info(f"Added condition: {condition_name}")
+        try:
+            if len(inspect.signature(condition_func).parameters) >= 1:
+                self._ctx_conditions.add(condition_name)
+        except (TypeError, ValueError):
+            pass
+        self._plan_dirty = True
+        logger.info("Added condition: %s", condition_name)
         return self
     
+    def add_expression(self, condition_name: str, expression: str) -> 'EV3Automation':
+        """
+        Add a composite condition built from existing condition names
+
+        Supports AND, OR, NOT and parentheses, e.g.
+        "battery_ok AND NOT docked". The expression is parsed once here,
+        not per check; at run time each leaf name is resolved through the
+        per-run cache, so a leaf shared by several expressions is
+        evaluated at most once per run, and AND/OR short-circuit.
+
+        Args:
+            condition_name: Name to reference the composite condition
+            expression: Boolean expression over registered condition names
+
+        Returns:
+            Self for method chaining
+        """
+        try:
+            self.conditions[condition_name] = self._parse_expression(expression)
+            self._plan_dirty = True
+            logger.info("Added expression condition: %s = %s",
+                        condition_name, expression)
+        except ValueError as e:
+            logger.error("Error parsing expression '%s': %s", expression, e)
+        return self
+
+    def _parse_expression(self, expression: str) -> Callable[[], bool]:
+        """
+        Compile a boolean expression into a zero-argument callable
+
+        Grammar (lowest to highest precedence): OR, AND, NOT, (expr), name.
+        """
+        tokens = expression.replace('(', ' ( ').replace(')', ' ) ').split()
+        pos = [0]
+
+        def peek() -> Optional[str]:
+            return tokens[pos[0]] if pos[0] < len(tokens) else None
+
+        def advance() -> str:
+            token = peek()
+            if token is None:
+                raise ValueError("unexpected end of expression")
+            pos[0] += 1
+            return token
+
+        def parse_or() -> Callable[[], bool]:
+            node = parse_and()
+            while peek() is not None and peek().upper() == 'OR':
+                advance()
+                rhs = parse_and()
+                node = (lambda l, r: lambda: l() or r())(node, rhs)
+            return node
+
+        def parse_and() -> Callable[[], bool]:
+            node = parse_not()
+            while peek() is not None and peek().upper() == 'AND':
+                advance()
+                rhs = parse_not()
+                node = (lambda l, r: lambda: l() and r())(node, rhs)
+            return node
+
+        def parse_not() -> Callable[[], bool]:
+            if peek() is not None and peek().upper() == 'NOT':
+                advance()
+                inner = parse_not()
+                return lambda: not inner()
+            return parse_atom()
+
+        def parse_atom() -> Callable[[], bool]:
+            token = advance()
+            if token == '(':
+                node = parse_or()
+                if peek() != ')':
+                    raise ValueError("missing closing parenthesis")
+                advance()
+                return node
+            if token == ')':
+                raise ValueError("unexpected ')'")
+            return lambda name=token: self._check_condition_cached(name)
+
+        node = parse_or()
+        if peek() is not None:
+            raise ValueError(f"unexpected token '{peek()}'")
+        return node
+
     def check_condition(self, condition_name: str) -> bool:
         """
         Check if a named condition is true
@@ -116,85 +390,243 @@ class EV3Automation:
             True if condition passes, False otherwise
         """
         if condition_name not in self.conditions:
-            logger.warning(f"Condition '{condition_name}' not found, assuming True")
+            logger.warning("Condition '%s' not found, assuming True", condition_name)
             return True
         
         try:
-            result = self.conditions[condition_name]()
-            logger.debug(f"Condition '{condition_name}' result: {result}")
+            if condition_name in self._ctx_conditions:
+                # Refresh the shared context in place - no per-check dict
+                # allocation
+                run = _current_run.get()
+                ctx = run.cond_ctx if run is not None else self._cond_ctx
+                ctx['now'] = time.monotonic()
+                result = self.conditions[condition_name](ctx)
+            else:
+                result = self.conditions[condition_name]()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Condition '%s' result: %s", condition_name, result)
             return result
         except Exception as e:
-            logger.error(f"Error checking condition '{condition_name}': {e}")
+            logger.error("Error checking condition '%s': %s", condition_name, e)
             return False
+
+    def _check_condition_cached(self, condition_name: str) -> bool:
+        """
+        Check a condition through the per-run cache
+
+        False results are cached just like True results; use
+        invalidate_condition() to force re-evaluation mid-run.
+        """
+        run = _current_run.get()
+        cache = run.cond_cache if run is not None else self._cond_cache
+        now = time.monotonic()
+        entry = cache.get(condition_name)
+        if entry is not None:
+            ts, value = entry
+            if self.condition_ttl is None or now - ts < self.condition_ttl:
+                return value
+
+        value = self.check_condition(condition_name)
+        cache[condition_name] = (now, value)
+        return value
+
+    def invalidate_condition(self, condition_name: str):
+        """
+        Drop a cached condition result so the next check re-evaluates it
+
+        Clears both the shared cache and the active run's cache when
+        called from within a run, since _check_condition_cached reads
+        the RunContext cache while a run is in flight.
+
+        Args:
+            condition_name: Name of the condition to invalidate
+        """
+        self._cond_cache.pop(condition_name, None)
+        run = _current_run.get()
+        if run is not None:
+            run.cond_cache.pop(condition_name, None)
     
-    def run_sequence(self, connect_first: bool = True) -> bool:
+    async def run_sequence_async(self, connect_first: bool = True,
+                                 ctx: Optional[RunContext] = None) -> bool:
         """
-        Execute the automation sequence
-        
+        Execute the automation sequence asynchronously
+
+        Blocking controller I/O runs in a worker thread via asyncio.to_thread
+        and waits use asyncio.sleep, so the scheduler and other automations
+        can run concurrently on the same event loop. Per-run mutable state
+        (condition cache/context) lives in a RunContext, so the same
+        automation can be gathered multiple times concurrently.
+
         Args:
             connect_first: Whether to connect to EV3 before running sequence
-        
+            ctx: Optional pre-built run context (e.g. with a different
+                controller); one is created when omitted
+
         Returns:
             True if sequence completed successfully
         """
         if not self.sequences:
             logger.warning("No automation sequence defined")
             return False
-        
-        if connect_first and not self.controller.is_connected():
+
+        if ctx is None:
+            ctx = RunContext(controller=self.controller)
+        controller = ctx.controller
+
+        if connect_first and not controller.is_connected():
             logger.info("Connecting to EV3...")
-            if not self.controller.connect():
+            if not await asyncio.to_thread(controller.connect):
                 logger.error("Failed to connect to EV3")
                 return False
-        
-        logger.info(f"Starting automation sequence with {len(self.sequences)} steps")
-        
+
+        logger.info("Starting automation sequence with %d steps", len(self.sequences))
+
+        # Maps batchable step kinds to their raw-command builders so
+        # contiguous unconditional steps can be coalesced into one
+        # Bluetooth write
+        command_builders = {
+            KIND_PROGRAM: controller.build_program_command,
+            KIND_SOUND: controller.build_sound_command,
+        }
+        # Rebind step handlers to the run's controller so a RunContext with
+        # a different controller is honored for every step kind
+        kind_handlers = {
+            KIND_PROGRAM: controller.run_program,
+            KIND_SOUND: controller.play_sound,
+        }
+
+        if self._plan_dirty:
+            self._plan = self._compile()
+            self._plan_dirty = False
+
+        token = _current_run.set(ctx)
         try:
-            for i, step in enumerate(self.sequences):
-                logger.info(f"Executing step {i+1}/{len(self.sequences)}: {step['type']}")
-                
-                # Check condition if specified
-                if step.get('condition') and not self.check_condition(step['condition']):
-                    logger.info(f"Skipping step {i+1} - condition not met")
-                    continue
-                
-                # Execute step based on type
-                if step['type'] == 'program':
-                    success = self.controller.run_program(step['program_name'])
-                    if not success:
-                        logger.error(f"Failed to run program: {step['program_name']}")
+            steps = self._plan
+            n = len(steps)
+            i = 0
+            # Local aliases for everything touched per iteration: LOAD_FAST
+            # instead of repeated attribute lookups in the hot loop
+            to_thread = asyncio.to_thread
+            sleep = asyncio.sleep
+            info = logger.info
+            run_batch = controller.run_batch
+            build_wait = controller.build_wait_command
+            cond_ctx = ctx.cond_ctx
+            # Waits are scheduled against an absolute monotonic deadline so
+            # per-sleep overshoot doesn't accumulate across the sequence;
+            # the deadline resyncs after each command since command runtime
+            # is not part of the requested pause.
+            clock = time.monotonic
+            deadline = clock()
+            while i < n:
+                step = steps[i]
+
+                # Batch a contiguous run of unconditional command steps
+                # into a single pipelined write: N short commands cost one
+                # Bluetooth round trip instead of N. Inter-step waits
+                # become on-brick opTIMER_WAIT commands inside the same
+                # write, and the host sleeps once to the batch's final
+                # deadline rather than between sends, so per-sleep
+                # overshoot can't accumulate across the batch.
+                if step.handler is not None and step.cond is None:
+                    batch = []
+                    j = i
+                    batch_wait = 0.0
+                    while j < n:
+                        s = steps[j]
+                        if s.cond is not None:
+                            break
+                        builder = command_builders.get(s.kind)
+                        if builder is None and s.kind != KIND_WAIT:
+                            break
+                        if builder is not None:
+                            batch.append(builder(*s.args))
+                        if s.wait != 0:
+                            batch.append(build_wait(s.wait))
+                            batch_wait += s.wait
+                        j += 1
+
+                    if len(batch) > 1:
+                        info("Executing steps %d-%d/%d as one batch", i + 1, j, n)
+                        if not await to_thread(run_batch, batch):
+                            logger.error("Batched steps %d-%d failed", i + 1, j)
+                            return False
+                        deadline = clock()
+                        if batch_wait > 0:
+                            info("Waiting %s seconds...", batch_wait)
+                            deadline += batch_wait
+                            remaining = deadline - clock()
+                            if remaining > 0:
+                                await sleep(remaining)
+                        i = j
+                        continue
+
+                info("Executing step %d/%d: %s", i + 1, n, _KIND_NAMES[step.kind])
+
+                # Check the precompiled condition if present - one pointer
+                # compare and a call, no name lookup
+                if step.cond is not None:
+                    cond_ctx['step_index'] = i
+                    if not step.cond():
+                        info("Skipping step %d - condition not met", i + 1)
+                        i += 1
+                        continue
+
+                # Dispatch through the precompiled handler; a None handler is
+                # a pure wait step unless it is a parallel group
+                if step.kind == KIND_PARALLEL:
+                    results = await asyncio.gather(
+                        *[sub.run_sequence_async(connect_first=False)
+                          for sub in step.args])
+                    if not all(results):
+                        logger.error("Step %d failed: parallel group", i + 1)
                         return False
-                    
-                    if step.get('wait_time', 0) > 0:
-                        logger.info(f"Waiting {step['wait_time']} seconds...")
-                        time.sleep(step['wait_time'])
-                
-                elif step['type'] == 'wait':
-                    logger.info(f"Waiting {step['duration']} seconds...")
-                    time.sleep(step['duration'])
-                
-                elif step['type'] == 'sound':
-                    success = self.controller.play_sound(step['frequency'], step['duration'])
+                    deadline = clock()
+                elif step.handler is not None:
+                    handler = kind_handlers.get(step.kind, step.handler)
+                    success = await to_thread(handler, *step.args)
                     if not success:
-                        logger.error("Failed to play sound")
+                        logger.error("Step %d failed: %s", i + 1, _KIND_NAMES[step.kind])
                         return False
-                    
-                    if step.get('wait_time', 0) > 0:
-                        logger.info(f"Waiting {step['wait_time']} seconds...")
-                        time.sleep(step['wait_time'])
-                
-                else:
-                    logger.warning(f"Unknown step type: {step['type']}")
-            
+                    deadline = clock()
+
+                if step.wait > 0:
+                    info("Waiting %s seconds...", step.wait)
+                    deadline += step.wait
+                    remaining = deadline - clock()
+                    if remaining > 0:
+                        await sleep(remaining)
+
+                i += 1
+
             logger.info("Automation sequence completed successfully")
             return True
-            
-        except KeyboardInterrupt:
-            logger.info("Automation sequence interrupted by user")
-            self.controller.stop_all_motors()
+
+        except asyncio.CancelledError:
+            logger.info("Automation sequence cancelled")
+            controller.stop_all_motors()
             return False
         except Exception as e:
-            logger.error(f"Error during automation sequence: {e}")
+            logger.error("Error during automation sequence: %s", e)
+            controller.stop_all_motors()
+            return False
+        finally:
+            _current_run.reset(token)
+
+    def run_sequence(self, connect_first: bool = True) -> bool:
+        """
+        Execute the automation sequence (blocking wrapper around run_sequence_async)
+
+        Args:
+            connect_first: Whether to connect to EV3 before running sequence
+
+        Returns:
+            True if sequence completed successfully
+        """
+        try:
+            return asyncio.run(self.run_sequence_async(connect_first))
+        except KeyboardInterrupt:
+            logger.info("Automation sequence interrupted by user")
             self.controller.stop_all_motors()
             return False
     
@@ -211,63 +643,153 @@ class EV3Automation:
         """
         try:
             if repeat == "daily":
-                schedule.every().day.at(time_str).do(self._scheduled_run)
+                interval = 86400.0
             elif repeat == "hourly":
-                # For hourly, we'll use the minutes part
-                minutes = int(time_str.split(':')[1])
-                schedule.every().hour.at(f":{minutes:02d}").do(self._scheduled_run)
+                interval = 3600.0
             elif repeat == "once":
-                schedule.every().day.at(time_str).do(self._scheduled_run).tag('once')
+                interval = None
             else:
-                logger.error(f"Unknown repeat option: {repeat}")
+                logger.error("Unknown repeat option: %s", repeat)
                 return self
-            
-            logger.info(f"Scheduled sequence to run {repeat} at {time_str}")
-            
+
+            job = ScheduledJob(time_str, repeat, interval, self._scheduled_run)
+            self._job_counter += 1
+            heapq.heappush(self._heap,
+                           (self._next_fire(time_str, repeat), self._job_counter, job))
+            self._my_jobs.append(job)
+            logger.info("Scheduled sequence to run %s at %s", repeat, time_str)
+
         except Exception as e:
-            logger.error(f"Error scheduling sequence: {e}")
+            logger.error("Error scheduling sequence: %s", e)
         
         return self
-    
+
+    @staticmethod
+    def _next_fire(time_str: str, repeat: str) -> float:
+        """Compute the epoch timestamp of the next fire for a HH:MM spec"""
+        now = datetime.now()
+        if repeat == "hourly":
+            minutes = int(time_str.split(':')[1])
+            target = now.replace(minute=minutes, second=0, microsecond=0)
+            if target <= now:
+                target += timedelta(hours=1)
+        else:
+            hours, minutes = (int(part) for part in time_str.split(':'))
+            target = now.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+            if target <= now:
+                target += timedelta(days=1)
+        return target.timestamp()
+
+    def _run_pending(self):
+        """
+        Drain every due job from the next-fire queue in one pass
+
+        A single timestamp read covers the whole drain, and a scheduler
+        that overslept (e.g. the host resumed from suspend) catches up on
+        all missed fires before going back to sleep.
+        """
+        heap = self._heap
+        now = time.time()
+        while heap and heap[0][0] <= now:
+            fire_ts, counter, job = heapq.heappop(heap)
+            try:
+                job.callback()
+            except Exception as e:
+                logger.error("Error in scheduled job: %s", e)
+
+            if job.interval is not None:
+                # Advance past any missed windows so catch-up doesn't
+                # re-fire the same job repeatedly
+                next_ts = fire_ts + job.interval
+                while next_ts <= now:
+                    next_ts += job.interval
+                heapq.heappush(heap, (next_ts, counter, job))
+            else:
+                if job in self._my_jobs:
+                    self._my_jobs.remove(job)
+                logger.info("One-time scheduled job completed and removed")
+
+    def _seconds_until_next(self, cap: float = 60.0) -> float:
+        """Seconds until the next job fires, capped so new jobs get noticed"""
+        if not self._heap:
+            return cap
+        return min(max(self._heap[0][0] - time.time(), 0.0), cap)
+
     def _scheduled_run(self):
-        """Internal method for scheduled execution"""
+        """Internal method for scheduled execution
+
+        Mirrors start_scheduler's dual-mode dispatch: when the scheduler
+        is a task on a running event loop the sequence is spawned as a
+        task on that same loop (run_sequence would call asyncio.run and
+        blow up); from the thread scheduler the blocking wrapper is fine.
+        """
         logger.info("Running scheduled automation sequence")
-        success = self.run_sequence()
-        
-        # If this was a "once" job, remove it
-        if any(job.tags and 'once' in job.tags for job in schedule.jobs):
-            schedule.clear('once')
-            logger.info("One-time scheduled job completed and removed")
-        
-        return success
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self.run_sequence()
+        return loop.create_task(self.run_sequence_async())
     
     def start_scheduler(self):
         """
         Start the background scheduler
         This will run scheduled sequences automatically
+
+        When called from a running asyncio event loop the scheduler runs as
+        a task on that loop; otherwise a daemon thread is used so plain
+        synchronous callers keep working.
         """
         if self.scheduler_running:
             logger.warning("Scheduler is already running")
             return
-        
+
         self.scheduler_running = True
-        
+        self._stop_event.clear()
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            # Already inside an event loop: no extra OS thread needed
+            self.scheduler_task = asyncio.create_task(self._scheduler_loop_async())
+            return
+
         def scheduler_loop():
             logger.info("Scheduler started")
-            while self.scheduler_running:
-                schedule.run_pending()
-                time.sleep(1)
+            while not self._stop_event.is_set():
+                self._run_pending()
+                # Sleep until the next job is due instead of waking every
+                # second; stop_scheduler() sets the event for an immediate
+                # wake-up.
+                self._stop_event.wait(timeout=self._seconds_until_next())
             logger.info("Scheduler stopped")
-        
+
         self.scheduler_thread = threading.Thread(target=scheduler_loop, daemon=True)
         self.scheduler_thread.start()
-    
+
+    async def _scheduler_loop_async(self):
+        """Scheduler loop that shares the caller's event loop"""
+        logger.info("Scheduler started")
+        try:
+            while self.scheduler_running:
+                self._run_pending()
+                await asyncio.sleep(self._seconds_until_next())
+        except asyncio.CancelledError:
+            pass
+        logger.info("Scheduler stopped")
+
     def stop_scheduler(self):
         """Stop the background scheduler"""
         if self.scheduler_running:
             self.scheduler_running = False
+            self._stop_event.set()
+            if self.scheduler_task:
+                self.scheduler_task.cancel()
+                self.scheduler_task = None
             if self.scheduler_thread:
                 self.scheduler_thread.join(timeout=2)
+                self.scheduler_thread = None
             logger.info("Scheduler stopped")
     
     def clear_sequence(self) -> 'EV3Automation':
@@ -278,48 +800,33 @@ class EV3Automation:
             Self for method chaining
         """
         self.sequences.clear()
+        self._pretty_lines.clear()
+        self._plan_dirty = True
         logger.info("Automation sequence cleared")
         return self
     
     def clear_schedule(self):
-        """Clear all scheduled jobs"""
-        schedule.clear()
+        """Clear this automation's scheduled jobs"""
+        self._heap.clear()
+        self._my_jobs.clear()
         logger.info("All scheduled jobs cleared")
-    
+
     def list_sequence(self):
         """Print the current automation sequence"""
         if not self.sequences:
             print("No automation sequence defined")
             return
         
-        print(f"\nAutomation Sequence ({len(self.sequences)} steps):")
-        print("-" * 50)
-        
-        for i, step in enumerate(self.sequences):
-            step_info = f"{i+1}. {step['type'].upper()}"
-            
-            if step['type'] == 'program':
-                step_info += f": {step['program_name']}"
-                if step.get('wait_time'):
-                    step_info += f" (wait {step['wait_time']}s)"
-                if step.get('condition'):
-                    step_info += f" [if {step['condition']}]"
-            
-            elif step['type'] == 'wait':
-                step_info += f": {step['duration']} seconds"
-            
-            elif step['type'] == 'sound':
-                step_info += f": {step['frequency']}Hz for {step['duration']}ms"
-                if step.get('wait_time'):
-                    step_info += f" (wait {step['wait_time']}s)"
-            
-            print(step_info)
-        
-        print("-" * 50)
+        # Lines were rendered at append time; one write instead of a
+        # format-and-print per step
+        print(f"\nAutomation Sequence ({len(self.sequences)} steps):\n"
+              + "-" * 50 + "\n"
+              + "\n".join(self._pretty_lines) + "\n"
+              + "-" * 50)
     
     def list_schedule(self):
-        """Print all scheduled jobs"""
-        jobs = schedule.jobs
+        """Print this automation's scheduled jobs"""
+        jobs = self._my_jobs
         if not jobs:
             print("No scheduled jobs")
             return
@@ -328,7 +835,7 @@ class EV3Automation:
         print("-" * 40)
         
         for job in jobs:
-            print(f"- {job}")
+            print(f"- {job.repeat} at {job.time_str}")
         
         print("-" * 40)
 
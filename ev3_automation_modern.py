@@ -5,16 +5,101 @@ Compatible with the modern async EV3 controller
 """
 
 import asyncio
-import time
-import threading
 import schedule
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Callable, Optional, Any
+from dataclasses import dataclass
+from typing import List, Dict, Callable, Optional, Any, ClassVar, Tuple, Union
 from ev3_controller_modern import ModernEV3Controller
 
 logger = logging.getLogger(__name__)
 
+# Use uvloop's libuv-based event loop when available - it has much cheaper
+# timer and task handling than the stdlib loop, which matters for the
+# scheduler and the many small sleeps in run_sequence. Falls back silently
+# to the default asyncio loop if uvloop is not installed.
+try:
+    import uvloop
+    uvloop.install()
+    logger.debug("uvloop installed as the asyncio event loop policy")
+except ImportError:
+    pass
+
+@dataclass(slots=True)
+class ProgramStep:
+    """Run a named EV3 program, optionally waiting afterwards"""
+    type: ClassVar[str] = 'program'
+
+    program_name: str
+    wait_time: float = 0
+    condition: Optional[str] = None
+
+    async def execute(self, controller: ModernEV3Controller) -> bool:
+        if not await controller.run_program(self.program_name):
+            logger.error("Failed to run program: %s", self.program_name)
+            return False
+        if self.wait_time > 0:
+            logger.info("Waiting %s seconds...", self.wait_time)
+            await asyncio.sleep(self.wait_time)
+        return True
+
+    def describe(self) -> str:
+        info = f"PROGRAM: {self.program_name}"
+        if self.wait_time:
+            info += f" (wait {self.wait_time}s)"
+        if self.condition:
+            info += f" [if {self.condition}]"
+        return info
+
+@dataclass(slots=True)
+class WaitStep:
+    """Pause the sequence for a fixed duration"""
+    type: ClassVar[str] = 'wait'
+
+    duration: float
+    condition: Optional[str] = None
+
+    async def execute(self, controller: ModernEV3Controller) -> bool:
+        logger.info("Waiting %s seconds...", self.duration)
+        await asyncio.sleep(self.duration)
+        return True
+
+    def describe(self) -> str:
+        return f"WAIT: {self.duration} seconds"
+
+@dataclass(slots=True)
+class SoundStep:
+    """Play a tone on the EV3, optionally waiting afterwards"""
+    type: ClassVar[str] = 'sound'
+
+    frequency: int = 440
+    duration: int = 1000
+    wait_time: float = 0
+    condition: Optional[str] = None
+
+    async def execute(self, controller: ModernEV3Controller) -> bool:
+        if not await controller.play_sound(self.frequency, self.duration):
+            logger.error("Failed to play sound")
+            return False
+        if self.wait_time > 0:
+            logger.info("Waiting %s seconds...", self.wait_time)
+            await asyncio.sleep(self.wait_time)
+        return True
+
+    def describe(self) -> str:
+        info = f"SOUND: {self.frequency}Hz for {self.duration}ms"
+        if self.wait_time:
+            info += f" (wait {self.wait_time}s)"
+        return info
+
+SequenceStep = Union[ProgramStep, WaitStep, SoundStep]
+
+@dataclass(slots=True)
+class BatchConfig:
+    """Tuning knobs for batched automation-event delivery"""
+    max_batch_size: int = 64
+    max_batch_delay: float = 0.0001
+    enabled: bool = False
+
 class ModernEV3Automation:
     """
     Modern automation system for EV3 programs
@@ -23,23 +108,73 @@ class ModernEV3Automation:
     
     def __init__(self, controller: Optional[ModernEV3Controller] = None):
         self.controller = controller or ModernEV3Controller()
-        self.sequences: List[Dict[str, Any]] = []
+        self.sequences: List[SequenceStep] = []
+        # Version counter for the sequence; lets read paths cache work
+        # keyed on it and skip re-rendering unchanged sequences
+        self._seq_version = 0
+        self._rendered_version = -1
+        self._rendered_str = ""
         self.scheduler_running = False
         self.scheduler_task: Optional[asyncio.Task] = None
-        self.conditions: Dict[str, Callable] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._once_jobs_pending = 0
+        self._job_count = 0
+        # name -> (callable, is_async), classified at registration
+        self.conditions: Dict[str, Tuple[Callable, bool]] = {}
+        self._cond_cache: Optional[Dict[str, bool]] = None
         self.automation_callbacks = []
-        
-    def add_automation_callback(self, callback):
-        """Add callback for automation events"""
-        self.automation_callbacks.append(callback)
-    
+        self.batch_config = BatchConfig()
+        self._pending_events: List[tuple] = []
+        self._flush_scheduled = False
+
+    def add_automation_callback(self, callback, batched: bool = False):
+        """
+        Add callback for automation events
+
+        Args:
+            callback: Called as callback(event, data), or with a list of
+                      (event, data) pairs when batched is True
+            batched: Deliver coalesced event batches instead of one call
+                     per event (only relevant with batch_config.enabled)
+        """
+        self.automation_callbacks.append((callback, batched))
+
     def _notify_automation_event(self, event: str, data: Any = None):
         """Notify all automation callbacks"""
-        for callback in self.automation_callbacks:
+        if self.batch_config.enabled:
             try:
-                callback(event, data)
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                self._pending_events.append((event, data))
+                if len(self._pending_events) >= self.batch_config.max_batch_size:
+                    self._flush_events()
+                elif not self._flush_scheduled:
+                    self._flush_scheduled = True
+                    loop.call_later(self.batch_config.max_batch_delay,
+                                    self._flush_events)
+                return
+        self._deliver_events([(event, data)])
+
+    def _flush_events(self):
+        """Deliver all buffered events in one pass over the callbacks"""
+        self._flush_scheduled = False
+        if self._pending_events:
+            batch = self._pending_events
+            self._pending_events = []
+            self._deliver_events(batch)
+
+    def _deliver_events(self, batch: List[tuple]):
+        for callback, batched in self.automation_callbacks:
+            try:
+                if batched:
+                    callback(batch)
+                else:
+                    for event, data in batch:
+                        callback(event, data)
             except Exception as e:
-                logger.error(f"Error in automation callback: {e}")
+                logger.error("Error in automation callback: %s", e)
     
     def add_program_step(self, program_name: str, wait_time: float = 0, 
                         condition: Optional[str] = None) -> 'ModernEV3Automation':
@@ -54,13 +189,9 @@ class ModernEV3Automation:
         Returns:
             Self for method chaining
         """
-        step = {
-            'type': 'program',
-            'program_name': program_name,
-            'wait_time': wait_time,
-            'condition': condition
-        }
+        step = ProgramStep(program_name, wait_time, condition)
         self.sequences.append(step)
+        self._seq_version += 1
         logger.info(f"Added program step: {program_name}")
         self._notify_automation_event("step_added", step)
         return self
@@ -75,11 +206,29 @@ class ModernEV3Automation:
         Returns:
             Self for method chaining
         """
-        step = {
-            'type': 'wait',
-            'duration': duration
-        }
+        # Fold into the previous step where the pause would be contiguous,
+        # so back-to-back waits cost a single asyncio timer at run time.
+        # Conditional steps are left alone - their trailing wait is skipped
+        # with them, unlike a standalone wait step.
+        if self.sequences:
+            last = self.sequences[-1]
+            if last.condition is None:
+                if isinstance(last, WaitStep):
+                    last.duration += duration
+                    self._seq_version += 1
+                    logger.info(f"Merged wait step into previous wait: {last.duration} seconds total")
+                    self._notify_automation_event("step_added", last)
+                    return self
+                if isinstance(last, (ProgramStep, SoundStep)):
+                    last.wait_time += duration
+                    self._seq_version += 1
+                    logger.info(f"Merged wait step into previous step: {last.wait_time} seconds total")
+                    self._notify_automation_event("step_added", last)
+                    return self
+
+        step = WaitStep(duration)
         self.sequences.append(step)
+        self._seq_version += 1
         logger.info(f"Added wait step: {duration} seconds")
         self._notify_automation_event("step_added", step)
         return self
@@ -97,13 +246,9 @@ class ModernEV3Automation:
         Returns:
             Self for method chaining
         """
-        step = {
-            'type': 'sound',
-            'frequency': frequency,
-            'duration': duration,
-            'wait_time': wait_time
-        }
+        step = SoundStep(frequency, duration, wait_time)
         self.sequences.append(step)
+        self._seq_version += 1
         logger.info(f"Added sound step: {frequency}Hz for {duration}ms")
         self._notify_automation_event("step_added", step)
         return self
@@ -119,43 +264,69 @@ class ModernEV3Automation:
         Returns:
             Self for method chaining
         """
-        self.conditions[condition_name] = condition_func
+        # Classify the function once at registration so the hot path does
+        # not have to type-check every result
+        self.conditions[condition_name] = (
+            condition_func, asyncio.iscoroutinefunction(condition_func))
         logger.info(f"Added condition: {condition_name}")
         return self
     
-    async def check_condition(self, condition_name: str) -> bool:
+    def invalidate_condition(self, condition_name: str):
+        """
+        Drop a memoized condition result so the next check re-evaluates it
+
+        Args:
+            condition_name: Name of the condition to invalidate
+        """
+        if self._cond_cache is not None:
+            self._cond_cache.pop(condition_name, None)
+
+    async def check_condition(self, condition_name: str,
+                              cache: Optional[Dict[str, bool]] = None) -> bool:
         """
         Check if a named condition is true (async version)
-        
+
         Args:
             condition_name: Name of the condition to check
-        
+            cache: Optional memo table; repeated checks of the same name
+                   within one table reuse the first result
+
         Returns:
             True if condition passes, False otherwise
         """
         if condition_name not in self.conditions:
-            logger.warning(f"Condition '{condition_name}' not found, assuming True")
+            logger.warning("Condition '%s' not found, assuming True", condition_name)
             return True
-        
+
+        if cache is not None and condition_name in cache:
+            return cache[condition_name]
+
         try:
-            # Handle both sync and async condition functions
-            result = self.conditions[condition_name]()
-            if asyncio.iscoroutine(result):
+            # Sync/async was determined when the condition was registered
+            func, is_async = self.conditions[condition_name]
+            result = func()
+            if is_async:
                 result = await result
-            
-            logger.debug(f"Condition '{condition_name}' result: {result}")
+
+            logger.debug("Condition '%s' result: %s", condition_name, result)
+            result = bool(result)
+            if cache is not None:
+                cache[condition_name] = result
             return result
         except Exception as e:
-            logger.error(f"Error checking condition '{condition_name}': {e}")
+            logger.error("Error checking condition '%s': %s", condition_name, e)
             return False
     
-    async def run_sequence(self, connect_first: bool = True) -> bool:
+    async def run_sequence(self, connect_first: bool = True,
+                           cache_conditions: bool = True) -> bool:
         """
         Execute the automation sequence asynchronously
-        
+
         Args:
             connect_first: Whether to connect to EV3 before running sequence
-        
+            cache_conditions: Evaluate each named condition at most once per
+                              run; disable for conditions with side effects
+
         Returns:
             True if sequence completed successfully
         """
@@ -172,52 +343,38 @@ class ModernEV3Automation:
                 self._notify_automation_event("connection_failed")
                 return False
         
-        logger.info(f"Starting automation sequence with {len(self.sequences)} steps")
+        logger.info("Starting automation sequence with %d steps", len(self.sequences))
         self._notify_automation_event("sequence_started", len(self.sequences))
-        
+
+        # Fresh memo table per run so conditions guarding several steps
+        # (e.g. battery checks) only hit the controller once
+        cond_cache: Optional[Dict[str, bool]] = {} if cache_conditions else None
+        self._cond_cache = cond_cache
+
+        # Hoist loop invariants so the per-step body sticks to fast local
+        # lookups
+        total = len(self.sequences)
+        notify = self._notify_automation_event
+        check_condition = self.check_condition
+        controller = self.controller
+
         try:
             for i, step in enumerate(self.sequences):
-                logger.info(f"Executing step {i+1}/{len(self.sequences)}: {step['type']}")
-                self._notify_automation_event("step_started", {"step": i+1, "total": len(self.sequences), "type": step['type']})
-                
+                logger.info("Executing step %d/%d: %s", i + 1, total, step.type)
+                notify("step_started", {"step": i+1, "total": total, "type": step.type})
+
                 # Check condition if specified
-                if step.get('condition') and not await self.check_condition(step['condition']):
-                    logger.info(f"Skipping step {i+1} - condition not met")
-                    self._notify_automation_event("step_skipped", {"step": i+1, "reason": "condition_not_met"})
+                if step.condition and not await check_condition(step.condition, cond_cache):
+                    logger.info("Skipping step %d - condition not met", i + 1)
+                    notify("step_skipped", {"step": i+1, "reason": "condition_not_met"})
                     continue
-                
-                # Execute step based on type
-                if step['type'] == 'program':
-                    success = await self.controller.run_program(step['program_name'])
-                    if not success:
-                        logger.error(f"Failed to run program: {step['program_name']}")
-                        self._notify_automation_event("step_failed", {"step": i+1, "program": step['program_name']})
-                        return False
-                    
-                    if step.get('wait_time', 0) > 0:
-                        logger.info(f"Waiting {step['wait_time']} seconds...")
-                        await asyncio.sleep(step['wait_time'])
-                
-                elif step['type'] == 'wait':
-                    logger.info(f"Waiting {step['duration']} seconds...")
-                    await asyncio.sleep(step['duration'])
-                
-                elif step['type'] == 'sound':
-                    success = await self.controller.play_sound(step['frequency'], step['duration'])
-                    if not success:
-                        logger.error("Failed to play sound")
-                        self._notify_automation_event("step_failed", {"step": i+1, "type": "sound"})
-                        return False
-                    
-                    if step.get('wait_time', 0) > 0:
-                        logger.info(f"Waiting {step['wait_time']} seconds...")
-                        await asyncio.sleep(step['wait_time'])
-                
-                else:
-                    logger.warning(f"Unknown step type: {step['type']}")
-                    self._notify_automation_event("step_unknown", {"step": i+1, "type": step['type']})
-                
-                self._notify_automation_event("step_completed", {"step": i+1, "type": step['type']})
+
+                # Each step type knows how to execute itself
+                if not await step.execute(controller):
+                    notify("step_failed", {"step": i+1, "type": step.type})
+                    return False
+
+                notify("step_completed", {"step": i+1, "type": step.type})
             
             logger.info("Automation sequence completed successfully")
             self._notify_automation_event("sequence_completed")
@@ -229,7 +386,7 @@ class ModernEV3Automation:
             await self.controller.stop_all_motors()
             return False
         except Exception as e:
-            logger.error(f"Error during automation sequence: {e}")
+            logger.error("Error during automation sequence: %s", e)
             self._notify_automation_event("sequence_error", str(e))
             await self.controller.stop_all_motors()
             return False
@@ -254,10 +411,12 @@ class ModernEV3Automation:
                 schedule.every().hour.at(f":{minutes:02d}").do(self._schedule_async_run)
             elif repeat == "once":
                 schedule.every().day.at(time_str).do(self._schedule_async_run).tag('once')
+                self._once_jobs_pending += 1
             else:
                 logger.error(f"Unknown repeat option: {repeat}")
                 return self
             
+            self._job_count += 1
             logger.info(f"Scheduled sequence to run {repeat} at {time_str}")
             self._notify_automation_event("sequence_scheduled", {"time": time_str, "repeat": repeat})
             
@@ -270,18 +429,28 @@ class ModernEV3Automation:
         """Internal method for scheduled execution (creates async task)"""
         logger.info("Running scheduled automation sequence")
         self._notify_automation_event("scheduled_run_started")
-        
-        # Create async task for the scheduled run
-        asyncio.create_task(self._async_scheduled_run())
+
+        # Use the loop captured in start_scheduler rather than looking it
+        # up per fire; call_soon_threadsafe keeps this correct even if the
+        # schedule callback runs on a different thread.
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(
+                lambda: loop.create_task(self._async_scheduled_run()))
+        else:
+            asyncio.create_task(self._async_scheduled_run())
     
     async def _async_scheduled_run(self):
         """Async scheduled run method"""
         try:
             success = await self.run_sequence()
             
-            # If this was a "once" job, remove it
-            if any(job.tags and 'once' in job.tags for job in schedule.jobs):
+            # If this was a "once" job, remove it (counter avoids scanning
+            # the global schedule.jobs list on every fire)
+            if self._once_jobs_pending:
                 schedule.clear('once')
+                self._job_count -= self._once_jobs_pending
+                self._once_jobs_pending = 0
                 logger.info("One-time scheduled job completed and removed")
                 self._notify_automation_event("once_job_completed")
             
@@ -302,13 +471,22 @@ class ModernEV3Automation:
             return
         
         self.scheduler_running = True
+        self._loop = asyncio.get_running_loop()
         self._notify_automation_event("scheduler_started")
-        
+
         async def scheduler_loop():
             logger.info("Async scheduler started")
             while self.scheduler_running:
+                # Sleep until the next job is actually due instead of
+                # polling every second; cap the wait so newly scheduled
+                # jobs are picked up within a minute.
+                delay = schedule.idle_seconds()
+                if delay is None:
+                    delay = 60
+                elif delay < 0:
+                    delay = 0
+                await asyncio.sleep(min(delay, 60))
                 schedule.run_pending()
-                await asyncio.sleep(1)
             logger.info("Async scheduler stopped")
         
         self.scheduler_task = asyncio.create_task(scheduler_loop())
@@ -334,6 +512,7 @@ class ModernEV3Automation:
             Self for method chaining
         """
         self.sequences.clear()
+        self._seq_version += 1
         logger.info("Automation sequence cleared")
         self._notify_automation_event("sequence_cleared")
         return self
@@ -341,49 +520,51 @@ class ModernEV3Automation:
     def clear_schedule(self):
         """Clear all scheduled jobs"""
         schedule.clear()
+        self._once_jobs_pending = 0
+        self._job_count = 0
         logger.info("All scheduled jobs cleared")
         self._notify_automation_event("schedule_cleared")
     
     def get_sequence_info(self) -> Dict[str, Any]:
-        """Get information about the current sequence"""
+        """
+        Get information about the current sequence
+
+        Note: 'steps' is a live view of the sequence, not a snapshot;
+        callers that need one can list() it. The job count is maintained
+        locally so this never walks the global schedule.jobs list.
+        """
         return {
             'step_count': len(self.sequences),
-            'steps': self.sequences.copy(),
+            'steps': self.sequences,
             'conditions': list(self.conditions.keys()),
             'scheduler_running': self.scheduler_running,
-            'scheduled_jobs': len(schedule.jobs)
+            'scheduled_jobs': self._job_count
         }
     
+    def get_sequence_str(self) -> str:
+        """
+        Rendered description of the current sequence
+
+        Cached against the sequence version counter, so UI code polling
+        this per tick only pays for formatting when steps actually change.
+        """
+        if self._rendered_version != self._seq_version:
+            if not self.sequences:
+                rendered = "No automation sequence defined"
+            else:
+                lines = [f"\nAutomation Sequence ({len(self.sequences)} steps):",
+                         "-" * 50]
+                lines.extend(f"{i+1}. {step.describe()}"
+                             for i, step in enumerate(self.sequences))
+                lines.append("-" * 50)
+                rendered = "\n".join(lines)
+            self._rendered_str = rendered
+            self._rendered_version = self._seq_version
+        return self._rendered_str
+
     def list_sequence(self):
         """Print the current automation sequence"""
-        if not self.sequences:
-            print("No automation sequence defined")
-            return
-        
-        print(f"\nAutomation Sequence ({len(self.sequences)} steps):")
-        print("-" * 50)
-        
-        for i, step in enumerate(self.sequences):
-            step_info = f"{i+1}. {step['type'].upper()}"
-            
-            if step['type'] == 'program':
-                step_info += f": {step['program_name']}"
-                if step.get('wait_time'):
-                    step_info += f" (wait {step['wait_time']}s)"
-                if step.get('condition'):
-                    step_info += f" [if {step['condition']}]"
-            
-            elif step['type'] == 'wait':
-                step_info += f": {step['duration']} seconds"
-            
-            elif step['type'] == 'sound':
-                step_info += f": {step['frequency']}Hz for {step['duration']}ms"
-                if step.get('wait_time'):
-                    step_info += f" (wait {step['wait_time']}s)"
-            
-            print(step_info)
-        
-        print("-" * 50)
+        print(self.get_sequence_str())
     
     def list_schedule(self):
         """Print all scheduled jobs"""
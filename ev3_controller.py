@@ -3,28 +3,65 @@ EV3 Bluetooth Controller
 A beginner-friendly Python application for controlling LEGO Mindstorms EV3 via Bluetooth
 """
 
+import asyncio
 import bluetooth
+import functools
+import re
+import select
+import socket
 import struct
 import time
 import logging
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Precompiled message formats for the hot Bluetooth send path:
+# [length:u16][counter:u8][type:u8] header and the SOUND_TONE command
+_HDR = struct.Struct('<HBB')
+_TONE = struct.Struct('<BBBHH')
+
+# OUTPUT_STOP, layer 0, all motors (A+B+C+D), brake - built once so the
+# emergency-stop path never allocates
+_STOP_ALL = bytes([0x0B, 0x00, 0x0F, 0x01])
+
+# opTIMER_WAIT with the pause in milliseconds
+_WAIT = struct.Struct('<Bi')
+
+# Prefer a BlueZ-direct stdlib RFCOMM socket where the platform supports
+# it (Linux); stdlib sockets send memoryviews without copying and skip
+# PyBluez's per-call wrapper layer. Elsewhere fall back to PyBluez.
+_HAS_AF_BLUETOOTH = hasattr(socket, 'AF_BLUETOOTH')
+
 class EV3Controller:
     """
     Main controller class for EV3 Bluetooth communication
     Designed to be beginner-friendly with simple method names and clear error messages
     """
-    
+
+    # Case-insensitive device-name match, compiled once instead of
+    # uppercasing every discovered name
+    _EV3_RE = re.compile(r'EV3', re.IGNORECASE)
+
     def __init__(self):
-        self.socket: Optional[bluetooth.BluetoothSocket] = None
+        # Either a stdlib AF_BLUETOOTH socket or a PyBluez BluetoothSocket
+        self.socket: Optional[Any] = None
         self.connected = False
         self.ev3_address = None
         self.ev3_name = None
-        
+        # Reusable transmit buffer so each send avoids fresh allocations
+        self._tx_buf = bytearray(1024)
+        # Lazily created worker for blocking Bluetooth discovery
+        self._discover_executor: Optional[ThreadPoolExecutor] = None
+        # When a pipeline() block is active, command payloads collect
+        # here instead of being sent one write at a time
+        self._pipeline_buf: Optional[List[bytes]] = None
+        # Last battery reading as (monotonic timestamp, percent)
+        self._batt_cache: Optional[Tuple[float, int]] = None
+
     def discover_ev3(self, timeout=10) -> Optional[str]:
         """
         Automatically discover EV3 devices nearby
@@ -33,14 +70,17 @@ class EV3Controller:
         logger.info("Searching for EV3 devices...")
         try:
             nearby_devices = bluetooth.discover_devices(duration=timeout, lookup_names=True)
-            
-            for addr, name in nearby_devices:
-                if "EV3" in name.upper():
-                    logger.info(f"Found EV3 device: {name} ({addr})")
-                    self.ev3_address = addr
-                    self.ev3_name = name
-                    return addr
-                    
+
+            search = self._EV3_RE.search
+            found = next(((addr, name) for addr, name in nearby_devices
+                          if name and search(name)), None)
+            if found is not None:
+                addr, name = found
+                logger.info(f"Found EV3 device: {name} ({addr})")
+                self.ev3_address = addr
+                self.ev3_name = name
+                return addr
+
             logger.warning("No EV3 devices found. Make sure your EV3 is:")
             logger.warning("1. Turned on")
             logger.warning("2. Bluetooth is enabled")
@@ -51,31 +91,70 @@ class EV3Controller:
             logger.error(f"Error during device discovery: {e}")
             return None
     
-    def connect(self, device_address: Optional[str] = None) -> bool:
+    async def discover_ev3_async(self, timeout=10) -> Optional[str]:
+        """
+        Async wrapper around discover_ev3
+
+        The underlying BlueZ scan blocks for up to `timeout` seconds, so
+        it runs on a dedicated single worker thread while the event loop
+        keeps servicing other coroutines.
+        """
+        if self._discover_executor is None:
+            self._discover_executor = ThreadPoolExecutor(max_workers=1)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._discover_executor,
+            functools.partial(self.discover_ev3, timeout))
+
+    def connect(self, device_address: Optional[str] = None,
+                low_latency: bool = False) -> bool:
         """
         Connect to EV3 device
         If no address provided, will try to auto-discover
+
+        Pass low_latency=True for interactive use: it shrinks the socket
+        send/receive buffers so short direct commands are flushed to the
+        link right away instead of pooling in a large kernel buffer.
+        Long scheduled runs can keep the defaults.
         """
         if device_address is None:
             device_address = self.discover_ev3()
             if device_address is None:
                 return False
-        
+
         try:
             logger.info(f"Connecting to EV3 at {device_address}...")
-            
+
             # Create Bluetooth socket
-            self.socket = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
-            
+            if _HAS_AF_BLUETOOTH:
+                self.socket = socket.socket(socket.AF_BLUETOOTH,
+                                            socket.SOCK_STREAM,
+                                            socket.BTPROTO_RFCOMM)
+            else:
+                self.socket = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
+
             # Connect to EV3 (port 1 is typically used for EV3 communication)
             self.socket.connect((device_address, 1))
-            
+
+            if low_latency:
+                # Best effort: EV3 direct commands are tens of bytes, so
+                # small kernel buffers keep them from queueing behind each
+                # other. Not every stack accepts sockopts on RFCOMM.
+                try:
+                    self.socket.setsockopt(socket.SOL_SOCKET,
+                                           socket.SO_SNDBUF, 1024)
+                    self.socket.setsockopt(socket.SOL_SOCKET,
+                                           socket.SO_RCVBUF, 1024)
+                except OSError as e:
+                    logger.debug(f"Low-latency socket options not applied: {e}")
+
             self.connected = True
             self.ev3_address = device_address
             logger.info("Successfully connected to EV3!")
             return True
-            
-        except bluetooth.BluetoothError as e:
+
+        except (bluetooth.BluetoothError, OSError) as e:
             logger.error(f"Bluetooth connection failed: {e}")
             logger.error("Make sure:")
             logger.error("1. EV3 is paired with this computer")
@@ -114,29 +193,172 @@ class EV3Controller:
         if not self.is_connected():
             logger.error("Not connected to EV3. Call connect() first.")
             return None
-        
+
+        if self._pipeline_buf is not None:
+            # Inside a pipeline() block: defer the command; everything
+            # queued goes out in one write when the block exits
+            self._pipeline_buf.append(bytes(command_bytes))
+            return b"OK"
+
         try:
             # EV3 direct command format: [length][counter][type][command]
+            # Pack into the reusable TX buffer instead of concatenating
+            # fresh bytes objects per call
             message_length = len(command_bytes)
-            counter = 0x00  # Message counter
-            command_type = 0x80  # Direct command, no reply
-            
-            # Create full message
-            header = struct.pack('<HBB', message_length, counter, command_type)
-            full_message = header + command_bytes
-            
+            total = _HDR.size + message_length
+            buf = self._tx_buf
+            if total > len(buf):
+                buf = self._tx_buf = bytearray(total)
+
+            _HDR.pack_into(buf, 0, message_length, 0x00, 0x80)
+            buf[_HDR.size:total] = command_bytes
+
             # Send command
-            self.socket.send(full_message)
-            logger.debug(f"Sent command: {full_message.hex()}")
-            
-            # For commands that expect a reply, we would read here
-            # For now, we'll keep it simple
+            self.socket.send(memoryview(buf)[:total])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sent command: %s", bytes(buf[:total]).hex())
+
+            # For commands that expect a reply, _recv_exact would read
+            # the framed response here. For now, we'll keep it simple
             return b"OK"
             
         except Exception as e:
             logger.error(f"Error sending command: {e}")
             return None
-    
+
+    def pipeline(self) -> 'EV3CommandPipeline':
+        """
+        Defer commands issued in a with-block and send them as one write
+
+        Commands like play_sound and run_program normally cost a
+        Bluetooth round trip each; inside a pipeline block they are
+        queued and flushed through run_batch on exit, so a scripted run
+        of K commands pays one link round trip. The brick executes them
+        in order (they are sent with the no-reply header), so follow the
+        block with a reply-carrying call such as get_battery_level when
+        confirmation matters.
+
+        Usage:
+            with controller.pipeline():
+                controller.play_sound(440, 500)
+                controller.run_program("TestMove")
+        """
+        return EV3CommandPipeline(self)
+
+    def _recv_exact(self, num_bytes: int, timeout: float = 1.0) -> Optional[bytes]:
+        """
+        Read exactly num_bytes from the socket without blocking forever
+
+        Waits for readability with select before each recv, so a brick
+        that never answers costs at most the timeout instead of a hung
+        thread, and short reads are retried until the frame is whole.
+        This is the read primitive for reply-carrying commands once
+        reply handling lands (see send_direct_command).
+        """
+        chunks = []
+        remaining = num_bytes
+        deadline = time.monotonic() + timeout
+        while remaining > 0:
+            wait = deadline - time.monotonic()
+            if wait <= 0 or not select.select([self.socket], [], [], wait)[0]:
+                logger.error("Timed out waiting for EV3 reply")
+                return None
+            chunk = self.socket.recv(remaining)
+            if not chunk:
+                logger.error("Connection closed while reading EV3 reply")
+                return None
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def flush_pipeline(self) -> bool:
+        """
+        Send any commands deferred by an active pipeline() block now
+
+        Reply-carrying calls use this so their response reflects every
+        command queued before them: the simplified protocol sends a zero
+        message counter on every frame, so ordering has to come from
+        flushing rather than from matching sequence numbers.
+        """
+        if not self._pipeline_buf:
+            return True
+        pending, self._pipeline_buf = self._pipeline_buf, []
+        return self.run_batch(pending)
+
+    def run_batch(self, command_list: List[bytes]) -> bool:
+        """
+        Send several direct commands in a single Bluetooth write
+
+        Each command is framed exactly like send_direct_command, but the
+        framed messages are concatenated and pushed through one socket
+        send, so a run of short commands costs one round trip instead
+        of one per command.
+
+        Args:
+            command_list: Raw command payloads (without headers)
+        """
+        if not self.is_connected():
+            logger.error("Not connected to EV3. Call connect() first.")
+            return False
+
+        if not command_list:
+            return True
+
+        try:
+            buffer = bytearray()
+            for command_bytes in command_list:
+                buffer += _HDR.pack(len(command_bytes), 0x00, 0x80)
+                buffer += command_bytes
+
+            self.socket.send(bytes(buffer))
+            logger.debug("Sent batch of %d commands", len(command_list))
+            return True
+
+        except Exception as e:
+            logger.error(f"Error sending command batch: {e}")
+            return False
+
+    def build_program_command(self, program_name: str) -> bytes:
+        """
+        Build the direct-command bytes that run_program sends
+        Useful for batching several commands into one write via run_batch
+        """
+        # EV3 direct command to start a program
+        # This is a simplified version - actual implementation would need
+        # proper EV3 bytecode for program execution
+
+        # Example: Move motor A forward for 1 second
+        # Opcode for motor control (simplified)
+        return bytes([
+            0x0A,  # OUTPUT_STEP_POWER
+            0x00,  # Layer
+            0x01,  # Motor A
+            0x32,  # Power (50%)
+            0x00, 0x00, 0x00, 0x00,  # Step1 (0)
+            0xE8, 0x03, 0x00, 0x00,  # Step2 (1000)
+            0xE8, 0x03, 0x00, 0x00,  # Step3 (1000)
+            0x01   # Brake
+        ])
+
+    def build_wait_command(self, duration: float) -> bytes:
+        """
+        Build the direct-command bytes for an on-brick pause
+
+        Lets a batched sequence keep its inter-step gaps without the host
+        sleeping between writes: the brick works through the queued
+        commands and pauses itself. Simplified like the other builders.
+        """
+        return _WAIT.pack(0x85, int(duration * 1000))
+
+    def build_sound_command(self, frequency: int = 440, duration: int = 1000) -> bytes:
+        """
+        Build the direct-command bytes that play_sound sends
+        Useful for batching several commands into one write via run_batch
+        """
+        # EV3 command to play a tone: SOUND, TONE, volume, then frequency
+        # and duration packed little-endian by the precompiled Struct
+        return _TONE.pack(0x94, 0x01, 0x01, frequency, duration)
+
     def run_program(self, program_name: str, wait_for_completion: bool = False) -> bool:
         """
         Run a program stored on the EV3
@@ -151,27 +373,11 @@ class EV3Controller:
         
         try:
             logger.info(f"Running program: {program_name}")
-            
-            # EV3 direct command to start a program
-            # This is a simplified version - actual implementation would need
-            # proper EV3 bytecode for program execution
-            
-            # For now, we'll create a basic motor movement as an example
+
+            # For now, this sends a basic motor movement as an example
             # In a real implementation, this would load and execute the specified program
-            
-            # Example: Move motor A forward for 1 second
-            # Opcode for motor control (simplified)
-            command = bytes([
-                0x0A,  # OUTPUT_STEP_POWER
-                0x00,  # Layer
-                0x01,  # Motor A
-                0x32,  # Power (50%)
-                0x00, 0x00, 0x00, 0x00,  # Step1 (0)
-                0xE8, 0x03, 0x00, 0x00,  # Step2 (1000)
-                0xE8, 0x03, 0x00, 0x00,  # Step3 (1000)
-                0x01   # Brake
-            ])
-            
+            command = self.build_program_command(program_name)
+
             result = self.send_direct_command(command)
             
             if result:
@@ -200,17 +406,15 @@ class EV3Controller:
         
         try:
             logger.info("Stopping all motors...")
-            
-            # EV3 command to stop all motors
-            command = bytes([
-                0x0B,  # OUTPUT_STOP
-                0x00,  # Layer
-                0x0F,  # All motors (A+B+C+D)
-                0x01   # Brake
-            ])
-            
-            result = self.send_direct_command(command)
-            
+
+            # An emergency stop never waits in a pipeline queue: bypass
+            # any active deferral and put it on the wire immediately
+            buffered, self._pipeline_buf = self._pipeline_buf, None
+            try:
+                result = self.send_direct_command(_STOP_ALL)
+            finally:
+                self._pipeline_buf = buffered
+
             if result:
                 logger.info("All motors stopped")
                 return True
@@ -236,16 +440,9 @@ class EV3Controller:
         
         try:
             logger.info(f"Playing sound: {frequency}Hz for {duration}ms")
-            
-            # EV3 command to play a tone
-            command = bytes([
-                0x94,  # SOUND
-                0x01,  # TONE
-                0x01,  # Volume (1-100)
-                frequency & 0xFF, (frequency >> 8) & 0xFF,  # Frequency (little endian)
-                duration & 0xFF, (duration >> 8) & 0xFF     # Duration (little endian)
-            ])
-            
+
+            command = self.build_sound_command(frequency, duration)
+
             result = self.send_direct_command(command)
             
             if result:
@@ -259,17 +456,32 @@ class EV3Controller:
             logger.error(f"Error playing sound: {e}")
             return False
     
-    def get_battery_level(self) -> Optional[int]:
+    def get_battery_level(self, max_age: float = 2.0) -> Optional[int]:
         """
         Get EV3 battery level (0-100%)
+
+        Battery level moves slowly, so the last reading is cached and
+        served for up to max_age seconds - callers that check it twice
+        within moments (sequence conditions, before/after summaries)
+        skip the second Bluetooth round trip. Pass max_age=0 to force
+        a fresh read, or a larger value when an approximate figure is
+        fine.
+
         Note: This is a placeholder - actual implementation would need
         proper EV3 communication protocol
         """
         if not self.is_connected():
             logger.error("Not connected to EV3. Call connect() first.")
             return None
-        
+
+        cached = self._batt_cache
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+
         try:
+            # The reply must observe everything queued ahead of it
+            self.flush_pipeline()
+
             # This would normally send a command to read battery level
             # For now, return a simulated value
             logger.info("Reading battery level...")
@@ -277,7 +489,8 @@ class EV3Controller:
             # In a real implementation, this would send a proper EV3 command
             # and parse the response to get the actual battery level
             battery_level = 75  # Simulated value
-            
+
+            self._batt_cache = (time.monotonic(), battery_level)
             logger.info(f"Battery level: {battery_level}%")
             return battery_level
             
@@ -288,7 +501,31 @@ class EV3Controller:
     def __enter__(self):
         """Context manager entry"""
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - ensures proper cleanup"""
         self.disconnect()
+
+
+class EV3CommandPipeline:
+    """
+    Context manager behind EV3Controller.pipeline()
+
+    Collects command payloads while the block runs and flushes them in a
+    single Bluetooth write on clean exit; on an exception the queued
+    commands are dropped rather than half-sent.
+    """
+
+    def __init__(self, controller: EV3Controller):
+        self.controller = controller
+
+    def __enter__(self) -> EV3Controller:
+        self.controller._pipeline_buf = []
+        return self.controller
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        buffered = self.controller._pipeline_buf
+        self.controller._pipeline_buf = None
+        if exc_type is None and buffered:
+            self.controller.run_batch(buffered)
+        return False
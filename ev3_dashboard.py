@@ -6,16 +6,19 @@ A PyQt-based GUI for monitoring and controlling LEGO Mindstorms EV3 robots
 
 import sys
 import asyncio
-import qasync
-from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                            QHBoxLayout, QGridLayout, QPushButton, QLabel, 
-                            QProgressBar, QTextEdit, QGroupBox, QLineEdit,
-                            QComboBox, QSpinBox, QTabWidget, QListWidget,
-                            QSplitter, QFrame)
-from PyQt6.QtCore import QTimer, pyqtSignal, QThread, pyqtSlot
-from PyQt6.QtGui import QFont, QPalette, QColor, QPixmap, QIcon
-from PyQt6.QtChart import QChart, QChartView, QLineSeries, QValueAxis
+import time
+from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                            QHBoxLayout, QGridLayout, QPushButton, QLabel,
+                            QProgressBar, QPlainTextEdit, QGroupBox, QLineEdit,
+                            QComboBox, QSpinBox, QTabWidget, QListView,
+                            QSplitter, QFrame, QGraphicsItem)
+from PySide6.QtCore import (QSignalMapper, QStringListModel, QTimer, Signal,
+                            QThread, Slot)
+from PySide6.QtGui import QFont, QPalette, QColor, QPixmap, QIcon, QTextCursor
+import PySide6.QtAsyncio as QtAsyncio
+import numpy as np
 import pyqtgraph as pg
+from collections import deque
 from datetime import datetime, timedelta
 import logging
 from typing import Optional
@@ -25,29 +28,29 @@ from ev3_controller_modern import ModernEV3Controller
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Render plot lines on the GPU and skip antialiasing; with downsampling
+# and view clipping enabled per-plot, pyqtgraph stays smooth well past
+# the current 100-point history
+pg.setConfigOptions(useOpenGL=True, antialias=False)
+
+# Shared connection-label styles, interned once instead of rebuilt at
+# every state change
+_STATUS_CONNECTED_STYLE = "color: #44ff44; font-weight: bold;"
+_STATUS_DISCONNECTED_STYLE = "color: #ff4444; font-weight: bold;"
+
+# Log font, created lazily on first use: QFont construction consults the
+# font database, and doing it at import would run before QApplication
+_MONO_FONT = None
+
 class EV3Dashboard(QMainWindow):
     """
     Main dashboard window for EV3 monitoring and control
     """
-    
-    def __init__(self):
-        super().__init__()
-        self.controller: Optional[ModernEV3Controller] = None
-        self.update_timer = QTimer()
-        self.battery_history = []
-        self.status_history = []
-        
-        self.init_ui()
-        self.setup_controller()
-        self.setup_timers()
-        
-    def init_ui(self):
-        """Initialize the user interface"""
-        self.setWindowTitle("EV3 Real-time Monitoring Dashboard")
-        self.setGeometry(100, 100, 1200, 800)
-        
-        # Set dark theme
-        self.setStyleSheet("""
+
+    # Dark-theme QSS, built once at import; Qt parses a stylesheet per
+    # setStyleSheet call, so instances share the parsed constant instead
+    # of re-allocating the blob per window
+    _STYLESHEET = """
             QMainWindow {
                 background-color: #2b2b2b;
                 color: #ffffff;
@@ -84,7 +87,7 @@ class EV3Dashboard(QMainWindow):
             QLabel {
                 color: #ffffff;
             }
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 border: 1px solid #555555;
                 color: #ffffff;
@@ -98,7 +101,67 @@ class EV3Dashboard(QMainWindow):
                 background-color: #4CAF50;
                 border-radius: 2px;
             }
-        """)
+        """
+    
+    def __init__(self):
+        super().__init__()
+        self.controller: Optional[ModernEV3Controller] = None
+        # Display refresh task; runs only while connected so the
+        # dashboard costs nothing when there is no data to show
+        self._update_task: Optional[asyncio.Task] = None
+        # Bounded history: deque evicts the oldest point in O(1) on
+        # append instead of list.pop(0)'s full-element shift
+        self.battery_history = deque(maxlen=100)
+        self.status_history = []
+        # Preallocated chart ring buffers: each tick writes one slot and
+        # hands NumPy views straight to setData, instead of rebuilding
+        # two Python lists that pyqtgraph would re-copy into arrays
+        self._bat_t = np.empty(100, dtype=np.float64)
+        self._bat_y = np.empty(100, dtype=np.float64)
+        self._bat_head = 0
+        self._bat_n = 0
+        self._bat_t0: Optional[float] = None
+        # Precomputed tables for the simulated signal/latency readouts:
+        # an hour of values generated once, cycled by index, instead of
+        # two RNG calls (and an import lookup) on every tick
+        self._fake_signal = np.random.randint(70, 101, 3600)
+        self._fake_lat = np.random.randint(10, 51, 3600)
+        self._fake_i = 0
+        # Pending log lines, flushed to the widget at most every 100 ms
+        # so a burst of messages costs one relayout instead of one each
+        self._log_buf = []
+        self._log_flush_pending = False
+        # Pending command-history entries, batched the same way
+        self._hist_buf = []
+        self._hist_flush_pending = False
+        # strftime result cached per clock second; bursty logging
+        # reformats once per second instead of once per message
+        self._ts_cache_s = -1
+        self._ts_cache = ""
+        # UI actions enqueue coroutines here for a single long-lived
+        # worker instead of spawning unreferenced tasks per click: the
+        # task objects can't be garbage-collected mid-flight and commands
+        # reach the controller in the order they were issued
+        self._cmd_q: asyncio.Queue = asyncio.Queue()
+        self._cmd_task: Optional[asyncio.Task] = None
+        # Render gate: samples only mark the plot dirty, and a 10 Hz
+        # timer (running while connected) repaints at most once per
+        # tick, so the render rate stays capped however fast data lands
+        self._plot_dirty = False
+        self._render_timer = QTimer()
+        self._render_timer.setInterval(100)
+        self._render_timer.timeout.connect(self._maybe_render)
+
+        self.init_ui()
+        self.setup_controller()
+        
+    def init_ui(self):
+        """Initialize the user interface"""
+        self.setWindowTitle("EV3 Real-time Monitoring Dashboard")
+        self.setGeometry(100, 100, 1200, 800)
+        
+        # Set dark theme
+        self.setStyleSheet(self._STYLESHEET)
         
         # Create central widget and main layout
         central_widget = QWidget()
@@ -117,8 +180,11 @@ class EV3Dashboard(QMainWindow):
         right_panel = self.create_right_panel()
         splitter.addWidget(right_panel)
         
-        # Set splitter proportions
-        splitter.setSizes([400, 800])
+        # Set splitter proportions via stretch factors (1:2); unlike
+        # setSizes after the widgets are added, this resolves in the
+        # initial layout pass instead of forcing a second one
+        splitter.setStretchFactor(0, 1)
+        splitter.setStretchFactor(1, 2)
         
     def create_left_panel(self) -> QWidget:
         """Create the left control panel"""
@@ -131,7 +197,7 @@ class EV3Dashboard(QMainWindow):
         
         # Connection status
         self.connection_status = QLabel("Disconnected")
-        self.connection_status.setStyleSheet("color: #ff4444; font-weight: bold;")
+        self.connection_status.setStyleSheet(_STATUS_DISCONNECTED_STYLE)
         conn_layout.addWidget(self.connection_status)
         
         # Device info
@@ -217,10 +283,17 @@ class EV3Dashboard(QMainWindow):
         quick_group = QGroupBox("Quick Actions")
         quick_layout = QVBoxLayout(quick_group)
         
+        # One mapper slot for all quick-action buttons instead of a
+        # closure per button: the mapper hands the program name straight
+        # to run_quick_program without a Python lambda in between
+        self._quick_map = QSignalMapper(self)
+        self._quick_map.mappedString.connect(self.run_quick_program)
+
         quick_programs = ["Initialize", "TestMove", "CleanRoom", "Patrol"]
         for program in quick_programs:
             btn = QPushButton(program)
-            btn.clicked.connect(lambda checked, p=program: self.run_quick_program(p))
+            self._quick_map.setMapping(btn, program)
+            btn.clicked.connect(self._quick_map.map)
             quick_layout.addWidget(btn)
         
         layout.addWidget(quick_group)
@@ -283,9 +356,18 @@ class EV3Dashboard(QMainWindow):
         self.battery_plot.setLabel('bottom', 'Time')
         self.battery_plot.showGrid(x=True, y=True)
         self.battery_plot.setYRange(0, 100)
+        # Peak-preserving downsampling plus clip-to-view keeps the
+        # per-frame work bounded by visible pixels, not history length
+        self.battery_plot.setDownsampling(auto=True, mode='peak')
+        self.battery_plot.setClipToView(True)
         
         # Create battery level curve
         self.battery_curve = self.battery_plot.plot(pen='b', name='Battery Level')
+        # Cache the rendered curve as a pixmap: pan/zoom/resize blit it
+        # instead of re-running the QPainter path; setData invalidates
+        # the cache through the update pyqtgraph already issues
+        self.battery_curve.setCacheMode(
+            QGraphicsItem.CacheMode.DeviceCoordinateCache)
         
         battery_layout.addWidget(self.battery_plot)
         layout.addWidget(battery_group)
@@ -326,10 +408,16 @@ class EV3Dashboard(QMainWindow):
         controls_layout.addStretch()
         layout.addLayout(controls_layout)
         
-        # Log display
-        self.log_display = QTextEdit()
+        # Log display: plain-text widget, so appends insert a block
+        # instead of reflowing rich text, with old lines evicted once
+        # the document passes 1000 blocks
+        self.log_display = QPlainTextEdit()
         self.log_display.setReadOnly(True)
-        self.log_display.setFont(QFont("Courier", 10))
+        self.log_display.document().setMaximumBlockCount(1000)
+        global _MONO_FONT
+        if _MONO_FONT is None:
+            _MONO_FONT = QFont("Courier", 10)
+        self.log_display.setFont(_MONO_FONT)
         layout.addWidget(self.log_display)
         
         return tab
@@ -343,7 +431,12 @@ class EV3Dashboard(QMainWindow):
         history_group = QGroupBox("Command History")
         history_layout = QVBoxLayout(history_group)
         
-        self.command_history = QListWidget()
+        # Model-backed view so history entries can be inserted in
+        # batches - one layout/repaint per burst instead of per item
+        self._history_model = QStringListModel()
+        self.command_history = QListView()
+        self.command_history.setModel(self._history_model)
+        self.command_history.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
         history_layout.addWidget(self.command_history)
         
         layout.addWidget(history_group)
@@ -373,20 +466,55 @@ class EV3Dashboard(QMainWindow):
         # Connect callbacks
         self.controller.add_connection_callback(self.on_connection_changed)
         self.controller.add_status_callback(self.on_status_changed)
-    
-    def setup_timers(self):
-        """Set up update timers"""
-        self.update_timer.timeout.connect(self.update_display)
-        self.update_timer.start(1000)  # Update every second
-    
-    @pyqtSlot()
+
+    def _enqueue_command(self, fn, *args):
+        """
+        Queue an async UI action for the command worker
+
+        The worker is started lazily on the first action because the
+        asyncio loop only exists once QtAsyncio.run is driving the
+        application, not at construction time.
+        """
+        if self._cmd_task is None or self._cmd_task.done():
+            self._cmd_task = asyncio.create_task(self._command_worker())
+        self._cmd_q.put_nowait((fn, args))
+
+    async def _command_worker(self):
+        """Run queued UI actions one at a time, routing errors to the log"""
+        while True:
+            fn, args = await self._cmd_q.get()
+            try:
+                await fn(*args)
+            except Exception as e:
+                self.log_message(f"Command error: {e}")
+            finally:
+                self._cmd_q.task_done()
+
+    async def _update_loop(self):
+        """
+        Refresh the display while connected
+
+        Replaces the old always-on 1 Hz QTimer: the coroutine is started
+        on connect and cancelled on disconnect, so a disconnected
+        dashboard never wakes up just to discover there is nothing to do.
+        """
+        # Read the battery level on a worker thread: against real
+        # hardware this is a blocking BLE read, and blocking here stalls
+        # every other task on the GUI-facing loop
+        loop = asyncio.get_running_loop()
+        read_battery = self.controller.get_battery_level
+        while True:
+            battery_level = await loop.run_in_executor(None, read_battery)
+            self._update_connected(battery_level)
+            await asyncio.sleep(1.0)
+
+    @Slot()
     def connect_to_ev3(self):
         """Connect to EV3 device"""
         self.log_message("Attempting to connect to EV3...")
         self.connect_btn.setEnabled(False)
         
-        # Run async connection in thread
-        asyncio.create_task(self._async_connect())
+        self._enqueue_command(self._async_connect)
     
     async def _async_connect(self):
         """Async connection method"""
@@ -401,11 +529,11 @@ class EV3Dashboard(QMainWindow):
             self.log_message(f"Connection error: {e}")
             self.connect_btn.setEnabled(True)
     
-    @pyqtSlot()
+    @Slot()
     def disconnect_from_ev3(self):
         """Disconnect from EV3 device"""
         self.log_message("Disconnecting from EV3...")
-        asyncio.create_task(self._async_disconnect())
+        self._enqueue_command(self._async_disconnect)
     
     async def _async_disconnect(self):
         """Async disconnection method"""
@@ -415,7 +543,7 @@ class EV3Dashboard(QMainWindow):
         except Exception as e:
             self.log_message(f"Disconnection error: {e}")
     
-    @pyqtSlot()
+    @Slot()
     def run_program(self):
         """Run the specified program"""
         program_name = self.program_input.text().strip()
@@ -424,7 +552,7 @@ class EV3Dashboard(QMainWindow):
             return
         
         self.log_message(f"Running program: {program_name}")
-        asyncio.create_task(self._async_run_program(program_name))
+        self._enqueue_command(self._async_run_program, program_name)
     
     async def _async_run_program(self, program_name: str):
         """Async program execution"""
@@ -432,17 +560,17 @@ class EV3Dashboard(QMainWindow):
             success = await self.controller.run_program(program_name)
             if success:
                 self.log_message(f"Program '{program_name}' started successfully")
-                self.command_history.addItem(f"{datetime.now().strftime('%H:%M:%S')} - Run: {program_name}")
+                self.add_history_entry(f"{self._ts()} - Run: {program_name}")
             else:
                 self.log_message(f"Failed to start program '{program_name}'")
         except Exception as e:
             self.log_message(f"Program execution error: {e}")
     
-    @pyqtSlot()
+    @Slot()
     def stop_all_motors(self):
         """Stop all motors"""
         self.log_message("Emergency stop - stopping all motors")
-        asyncio.create_task(self._async_stop_motors())
+        self._enqueue_command(self._async_stop_motors)
     
     async def _async_stop_motors(self):
         """Async motor stop"""
@@ -450,20 +578,20 @@ class EV3Dashboard(QMainWindow):
             success = await self.controller.stop_all_motors()
             if success:
                 self.log_message("All motors stopped")
-                self.command_history.addItem(f"{datetime.now().strftime('%H:%M:%S')} - Emergency Stop")
+                self.add_history_entry(f"{self._ts()} - Emergency Stop")
             else:
                 self.log_message("Failed to stop motors")
         except Exception as e:
             self.log_message(f"Stop motors error: {e}")
     
-    @pyqtSlot()
+    @Slot()
     def play_test_sound(self):
         """Play test sound"""
         freq = self.freq_spin.value()
         duration = self.duration_spin.value()
         
         self.log_message(f"Playing sound: {freq}Hz for {duration}ms")
-        asyncio.create_task(self._async_play_sound(freq, duration))
+        self._enqueue_command(self._async_play_sound, freq, duration)
     
     async def _async_play_sound(self, freq: int, duration: int):
         """Async sound playing"""
@@ -471,7 +599,7 @@ class EV3Dashboard(QMainWindow):
             success = await self.controller.play_sound(freq, duration)
             if success:
                 self.log_message("Sound played successfully")
-                self.command_history.addItem(f"{datetime.now().strftime('%H:%M:%S')} - Sound: {freq}Hz")
+                self.add_history_entry(f"{self._ts()} - Sound: {freq}Hz")
             else:
                 self.log_message("Failed to play sound")
         except Exception as e:
@@ -486,74 +614,156 @@ class EV3Dashboard(QMainWindow):
         """Handle connection status changes"""
         if connected:
             self.connection_status.setText("Connected")
-            self.connection_status.setStyleSheet("color: #44ff44; font-weight: bold;")
+            self.connection_status.setStyleSheet(_STATUS_CONNECTED_STYLE)
             self.connect_btn.setEnabled(False)
             self.disconnect_btn.setEnabled(True)
             
             info = self.controller.get_connection_info()
             self.device_info.setText(f"Device: {info['device_name']} ({info['device_address']})")
-            
+
+            if self._update_task is None or self._update_task.done():
+                self._update_task = asyncio.create_task(self._update_loop())
+            self._render_timer.start()
+
         else:
             self.connection_status.setText("Disconnected")
-            self.connection_status.setStyleSheet("color: #ff4444; font-weight: bold;")
+            self.connection_status.setStyleSheet(_STATUS_DISCONNECTED_STYLE)
             self.connect_btn.setEnabled(True)
             self.disconnect_btn.setEnabled(False)
             self.device_info.setText("No device connected")
+
+            if self._update_task is not None:
+                self._update_task.cancel()
+                self._update_task = None
+            self._render_timer.stop()
+            # Leave _plot_dirty set so any final sample renders on the
+            # next connection
+
     
     def on_status_changed(self, status: str):
         """Handle status changes"""
         self.current_status.setText(status)
-        self.last_update.setText(f"Last update: {datetime.now().strftime('%H:%M:%S')}")
+        self.last_update.setText(f"Last update: {self._ts()}")
         self.log_message(f"Status: {status}")
     
     def update_display(self):
         """Update the display with current data"""
+        # Kept as the safe entry point for ad-hoc callers; the
+        # connection-scoped update loop calls _update_connected
+        # directly and skips the per-tick guard
         if self.controller and self.controller.is_connected():
-            # Update battery level
+            self._update_connected()
+
+    def _update_connected(self, battery_level: Optional[int] = None):
+        """Refresh battery, chart and link readouts; assumes connected"""
+        # Update battery level; the async update loop reads it off-loop
+        # and passes it in, ad-hoc callers let us read it here
+        if battery_level is None:
             battery_level = self.controller.get_battery_level()
-            self.battery_label.setText(f"Battery: {battery_level}%")
-            self.battery_progress.setValue(battery_level)
-            
-            # Update battery chart
-            current_time = datetime.now()
-            self.battery_history.append((current_time, battery_level))
-            
-            # Keep only last 100 points
-            if len(self.battery_history) > 100:
-                self.battery_history.pop(0)
+        self.battery_label.setText(f"Battery: {battery_level}%")
+        self.battery_progress.setValue(battery_level)
             
-            # Update plot
-            if len(self.battery_history) > 1:
-                times = [(t - self.battery_history[0][0]).total_seconds() for t, _ in self.battery_history]
-                levels = [level for _, level in self.battery_history]
-                self.battery_curve.setData(times, levels)
-            
-            # Simulate signal strength
-            import random
-            signal = random.randint(70, 100)
-            self.signal_strength.setValue(signal)
-            
-            # Simulate latency
-            latency = random.randint(10, 50)
-            self.latency_label.setText(f"Latency: {latency} ms")
+        # Update battery chart
+        current_time = datetime.now()
+        self.battery_history.append((current_time, battery_level))
+
+        # Write the sample into the ring buffers; the x axis is
+        # seconds since the first sample of the session
+        now_s = current_time.timestamp()
+        if self._bat_t0 is None:
+            self._bat_t0 = now_s
+        self._bat_t[self._bat_head] = now_s - self._bat_t0
+        self._bat_y[self._bat_head] = battery_level
+        self._bat_head = (self._bat_head + 1) % 100
+        if self._bat_n < 100:
+            self._bat_n += 1
+
+        # Mark the plot dirty; _maybe_render repaints on its own clock
+        self._plot_dirty = True
+
+
+        # Simulated signal strength and latency, read from the
+        # precomputed tables
+        i = self._fake_i
+        self.signal_strength.setValue(int(self._fake_signal[i]))
+        self.latency_label.setText(f"Latency: {self._fake_lat[i]} ms")
+        self._fake_i = (i + 1) % 3600
     
+    def _maybe_render(self):
+        """Push ring-buffer data to the plot if new samples arrived"""
+        if not self._plot_dirty or self._bat_n < 2:
+            return
+        self._plot_dirty = False
+        if self._bat_n < 100:
+            times = self._bat_t[:self._bat_n]
+            levels = self._bat_y[:self._bat_n]
+        else:
+            # Ring is full: the oldest sample sits at head, so unwrap
+            # into chronological order
+            head = self._bat_head
+            times = np.concatenate((self._bat_t[head:], self._bat_t[:head]))
+            levels = np.concatenate((self._bat_y[head:], self._bat_y[:head]))
+        self.battery_curve.setData(times, levels)
+
+    def _ts(self) -> str:
+        """Wall-clock HH:MM:SS, reformatted only when the second changes"""
+        s = int(time.time())
+        if s != self._ts_cache_s:
+            self._ts_cache_s = s
+            self._ts_cache = time.strftime("%H:%M:%S", time.localtime(s))
+        return self._ts_cache
+
     def log_message(self, message: str):
-        """Add a message to the log display"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
-        self.log_display.append(formatted_message)
-        
-        # Auto-scroll to bottom
-        scrollbar = self.log_display.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        """Queue a message for the log display"""
+        self._log_buf.append(f"[{self._ts()}] {message}")
+
+        # Coalesce: the first message of a burst schedules one flush;
+        # everything arriving within the window rides along for free
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            QTimer.singleShot(100, self._flush_logs)
+
+    def add_history_entry(self, entry: str):
+        """Queue a command-history entry for the history view"""
+        self._hist_buf.append(entry)
+        if not self._hist_flush_pending:
+            self._hist_flush_pending = True
+            QTimer.singleShot(100, self._flush_history)
+
+    def _flush_history(self):
+        """Insert all pending history entries in one model update"""
+        self._hist_flush_pending = False
+        if not self._hist_buf:
+            return
+        model = self._history_model
+        row = model.rowCount()
+        model.insertRows(row, len(self._hist_buf))
+        for offset, entry in enumerate(self._hist_buf):
+            model.setData(model.index(row + offset), entry)
+        self._hist_buf.clear()
+
+    def _flush_logs(self):
+        """Append all pending log lines in a single document update"""
+        self._log_flush_pending = False
+        if not self._log_buf:
+            return
+        self.log_display.appendPlainText("\n".join(self._log_buf))
+        self._log_buf.clear()
+
+        # Auto-scroll by moving the cursor to the end once per flush;
+        # querying the scrollbar maximum would force an extra layout
+        # pass just to compute the range
+        self.log_display.moveCursor(QTextCursor.MoveOperation.End)
+        self.log_display.ensureCursorVisible()
     
-    @pyqtSlot()
+    @Slot()
     def clear_logs(self):
         """Clear the log display"""
+        self._log_buf.clear()
         self.log_display.clear()
         self.log_message("Logs cleared")
     
-    @pyqtSlot()
+    @Slot()
     def save_logs(self):
         """Save logs to file"""
         # This would open a file dialog and save logs
@@ -562,28 +772,27 @@ class EV3Dashboard(QMainWindow):
     def closeEvent(self, event):
         """Handle window close event"""
         if self.controller and self.controller.is_connected():
-            asyncio.create_task(self.controller.disconnect())
+            self._enqueue_command(self.controller.disconnect)
         event.accept()
 
-async def main():
+def main():
     """Main application entry point"""
     app = QApplication(sys.argv)
-    
-    # Set up async event loop
-    loop = qasync.QEventLoop(app)
-    asyncio.set_event_loop(loop)
-    
+
     # Create and show dashboard
     dashboard = EV3Dashboard()
     dashboard.show()
-    
-    # Run the event loop
-    with loop:
-        await loop.run_forever()
+
+    # QtAsyncio drives asyncio off Qt's native event dispatcher - no
+    # polling timer bridging the two loops, so the dashboard costs
+    # nothing while idle and async callbacks fire without a
+    # polling-interval delay. keep_running keeps the loop alive until
+    # the window closes.
+    QtAsyncio.run(keep_running=True)
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        main()
     except KeyboardInterrupt:
         print("Application interrupted")
     except Exception as e:
@@ -11,7 +11,7 @@ This file demonstrates various ways to use the EV3 controller:
 """
 
 import sys
-import time
+import threading
 import logging
 from ev3_controller import EV3Controller
 from ev3_automation import EV3Automation, create_cleaning_sequence, create_patrol_sequence
@@ -42,23 +42,19 @@ def basic_example():
             print("3. EV3 is paired with this computer")
             return False
         
-        # Play a welcome sound
-        print("Playing welcome sound...")
-        controller.play_sound(440, 1000)  # A note for 1 second
-        time.sleep(1.5)
-        
-        # Check battery level
+        # Queue the scripted commands and send them in one Bluetooth
+        # write; the brick runs them in order
+        print("Sending welcome sound, test program and completion sound...")
+        with controller.pipeline():
+            controller.play_sound(440, 1000)  # A note for 1 second
+            controller.run_program("TestProgram")
+            controller.play_sound(880, 500)  # Higher pitch for completion
+
+        # A reply-carrying read after the pipeline confirms the link
+        # processed everything queued above
         battery = controller.get_battery_level()
         print(f"EV3 Battery level: {battery}%")
         
-        # Run a program (this will execute a basic motor movement)
-        print("Running test program...")
-        controller.run_program("TestProgram", wait_for_completion=True)
-        
-        # Play completion sound
-        print("Playing completion sound...")
-        controller.play_sound(880, 500)  # Higher pitch for completion
-        
         print("Basic example completed successfully!")
         return True
         
@@ -155,10 +151,11 @@ def scheduled_automation_example():
         print("Starting scheduler... (Press Ctrl+C to stop)")
         cleaning_automation.start_scheduler()
         
-        # Keep running until interrupted
+        # Keep the main thread parked without waking every second; the
+        # scheduler thread sleeps to its own job deadlines and Ctrl+C
+        # still interrupts the wait immediately
         try:
-            while True:
-                time.sleep(1)
+            threading.Event().wait()
         except KeyboardInterrupt:
             print("\nStopping scheduler...")
             cleaning_automation.stop_scheduler()
@@ -213,7 +210,8 @@ def interactive_mode():
                 if controller.is_connected():
                     print("Already connected to EV3")
                 else:
-                    if controller.connect():
+                    # Manual control benefits from low-latency round trips
+                    if controller.connect(low_latency=True):
                         print("Connected to EV3 successfully")
                     else:
                         print("Failed to connect to EV3")
@@ -6,6 +6,7 @@ This script demonstrates how to create an automated cleaning sequence for an EV3
 
 import sys
 import os
+import threading
 import time
 
 # Add parent directory to path so we can import our modules
@@ -20,9 +21,10 @@ def create_custom_cleaning_sequence(controller):
     """
     automation = EV3Automation(controller)
     
-    # Add conditions for safety
-    automation.add_condition("battery_sufficient", 
-                           lambda: controller.get_battery_level() > 25)
+    # Add conditions for safety; an approximate battery figure is fine
+    # for a threshold check, so let a reading up to 10s old satisfy it
+    automation.add_condition("battery_sufficient",
+                           lambda: controller.get_battery_level(max_age=10) > 25)
     
     automation.add_condition("ready_to_clean", 
                            lambda: True)  # Could check sensors here
@@ -124,8 +126,9 @@ def main():
             print(f"\n✅ Cleaning completed successfully!")
             print(f"⏱️  Total time: {duration:.1f} seconds")
             
-            # Final status
-            final_battery = controller.get_battery_level()
+            # Final status - force a fresh read so the usage figure
+            # reflects the run that just finished
+            final_battery = controller.get_battery_level(max_age=0)
             battery_used = battery - final_battery
             print(f"🔋 Battery used: {battery_used}%")
             print(f"🔋 Remaining battery: {final_battery}%")
@@ -189,10 +192,11 @@ def schedule_daily_cleaning():
         
         cleaning_automation.start_scheduler()
         
-        # Keep running
+        # Park the main thread without waking every second; the
+        # scheduler sleeps to its own job deadlines and Ctrl+C still
+        # interrupts the wait immediately
         try:
-            while True:
-                time.sleep(1)
+            threading.Event().wait()
         except KeyboardInterrupt:
             print("\n⏹️  Stopping scheduler...")
             cleaning_automation.stop_scheduler()
@@ -26,7 +26,9 @@ def main():
     try:
         # Connect to EV3
         print("Connecting to EV3...")
-        if not controller.connect():
+        # Interactive example: small socket buffers keep per-command
+        # round trips snappy
+        if not controller.connect(low_latency=True):
             print("❌ Failed to connect to EV3")
             print("\nTroubleshooting:")
             print("1. Make sure your EV3 is turned on")
@@ -46,28 +48,18 @@ def main():
             if battery < 20:
                 print("⚠️  Warning: Battery level is low!")
         
-        # Play welcome sound
-        print("\nPlaying welcome sound...")
-        controller.play_sound(440, 1000)  # A note for 1 second
-        time.sleep(1.5)
-        
-        # Run a test program
-        print("\nRunning test program...")
-        print("(This will move motors if connected)")
-        
-        success = controller.run_program("TestMove")
-        if success:
-            print("✅ Program executed successfully")
-        else:
-            print("❌ Program execution failed")
-        
-        # Wait a bit
+        # Queue the scripted commands and send them in one Bluetooth
+        # write instead of a round trip each
+        print("\nSending welcome sound, test program and completion sound...")
+        print("(The program will move motors if connected)")
+        with controller.pipeline():
+            controller.play_sound(440, 1000)  # A note for 1 second
+            controller.run_program("TestMove")
+            controller.play_sound(880, 500)  # Higher pitch
+
+        # Give the brick time to work through the queued commands
         time.sleep(2)
         
-        # Play completion sound
-        print("\nPlaying completion sound...")
-        controller.play_sound(880, 500)  # Higher pitch
-        
         print("\n✅ Simple control example completed!")
         
     except KeyboardInterrupt:
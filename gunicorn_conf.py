@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for the Color Display API
+
+Run with: gunicorn -c gunicorn_conf.py main:app
+
+Access logging is disabled and the log level raised to warning:
+per-request log formatting is a measurable share of CPU for a
+service whose handlers are this cheap.
+
+Note that WebSocket broadcast state lives in each worker process, so
+clients connected to different workers only see updates sent through
+their own worker. Keep workers = 1 if every dashboard must see every
+color change; the multi-worker default is for HTTP-heavy loads.
+"""
+
+import multiprocessing
+
+bind = "0.0.0.0:8000"
+workers = multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+loglevel = "warning"
+accesslog = None
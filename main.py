@@ -1,41 +1,240 @@
-from fastapi import FastAPI, Request, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-import re
-import json
-from typing import List
+from jinja2 import Environment, FileSystemLoader
+from starlette.exceptions import HTTPException as StarletteHTTPException
+import asyncio
+import mimetypes
+import msgpack
+import orjson
+import stat
+from functools import lru_cache
+from random import getrandbits
+from typing import Dict, Set, Tuple
 
-app = FastAPI(title="Color Display API")
+app = FastAPI(title="Color Display API", default_response_class=ORJSONResponse)
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Only cache assets small enough that holding the whole set in memory
+# is obviously fine
+_STATIC_CACHE_LIMIT = 64 * 1024
 
-# Set up templates
-templates = Jinja2Templates(directory="templates")
+class CachedStaticFiles(StaticFiles):
+    """
+    Static file mount that serves small assets from an in-memory cache
+
+    The asset set is small and fixed, so each file is read once and
+    subsequent requests are answered from cached bytes - no per-request
+    open/read/close syscalls. Entries are keyed on (path, mtime, size)
+    so an edited file is picked up on its next request. Anything larger
+    than the cache limit falls back to Starlette's streaming reader.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache: Dict[Tuple[str, float, int], bytes] = {}
+
+    async def get_response(self, path: str, scope) -> Response:
+        full_path, stat_result = self.lookup_path(path)
+        if (stat_result is None
+                or not stat.S_ISREG(stat_result.st_mode)
+                or stat_result.st_size > _STATIC_CACHE_LIMIT):
+            return await super().get_response(path, scope)
+
+        key = (full_path, stat_result.st_mtime, stat_result.st_size)
+        body = self._cache.get(key)
+        if body is None:
+            with open(full_path, "rb") as f:
+                body = f.read()
+            self._cache[key] = body
+        media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+        return Response(body, media_type=media_type)
+
+# Mount static files (check_dir=False so checkouts without assets still
+# import cleanly)
+app.mount("/static", CachedStaticFiles(directory="static", check_dir=False),
+          name="static")
+
+@app.exception_handler(StarletteHTTPException)
+async def _http_exception_handler(request, exc):
+    # Encode error payloads straight through orjson instead of
+    # FastAPI's default handler, which routes the detail through
+    # jsonable_encoder before stdlib json
+    return Response(orjson.dumps({"detail": exc.detail}),
+                    status_code=exc.status_code,
+                    headers=exc.headers,
+                    media_type="application/json")
+
+# One compiled template for the whole process, loaded through a plain
+# jinja2 Environment rather than the Jinja2Templates wrapper - the
+# endpoints never need the request in the template context, and
+# autoescape is off because the only interpolated value is a validated
+# color code. Rendering TEMPLATE directly is the fallback path if the
+# page ever grows more variables than the segment cache below handles.
+_env = Environment(loader=FileSystemLoader("templates"))
+TEMPLATE = _env.get_template("index.html")
+
+# The color page's only variable is the color string, so render the
+# template once at import with a sentinel and serve requests by joining
+# the pre-encoded segments around the color - no Jinja work per request.
+# The template picks black text for the exact string "#FFFFFF" and white
+# text otherwise; the sentinel render bakes in the "otherwise" branch,
+# so the white page is cached separately as its own fully rendered bytes.
+_COLOR_SENTINEL = "__COLOR__"
+_PAGE_SEGMENTS = tuple(
+    segment.encode("utf-8")
+    for segment in TEMPLATE.render(color=_COLOR_SENTINEL).split(_COLOR_SENTINEL)
+)
+_WHITE_PAGE = TEMPLATE.render(color="#FFFFFF").encode("utf-8")
 
-# Regular expression to validate hex color codes
-hex_pattern = re.compile(r'^#?([0-9A-Fa-f]{3}|[0-9A-Fa-f]{6})$')
+
+@lru_cache(maxsize=4096)
+def _render_color_bytes(color_code: str) -> bytes:
+    """
+    Joined page bytes for one color, memoized
+
+    The valid color space is 16M codes but typical traffic repeats a
+    few dozen, so repeats skip even the segment join.
+    """
+    return color_code.encode("ascii").join(_PAGE_SEGMENTS)
+
+def render_color_page(color_code: str) -> HTMLResponse:
+    """Build the color page response from the pre-rendered segments"""
+    if color_code == "#FFFFFF":
+        return HTMLResponse(_WHITE_PAGE)
+    return HTMLResponse(_render_color_bytes(color_code))
+
+# Hex digits as a bytes.translate deletion table: translate strips every
+# valid digit in one C pass, so a code is valid exactly when nothing
+# survives. Cheaper per request than spinning up the regex engine for a
+# 3-6 character check.
+_HEX_DIGITS = b"0123456789abcdefABCDEF"
+
+# Two-digit hex strings for every byte value, so turning RGB components
+# into a color code is three tuple lookups instead of three trips
+# through the string formatter
+_HEX2 = tuple(f"{i:02x}" for i in range(256))
+
+def is_hex_color(color: str) -> bool:
+    """Check that color is a 3- or 6-digit hex code, # optional"""
+    color = color.removeprefix('#')
+    if len(color) not in (3, 6):
+        return False
+    try:
+        raw = color.encode('ascii')
+    except UnicodeEncodeError:
+        return False
+    return raw.translate(None, _HEX_DIGITS) == b""
 
 # WebSocket connection manager
 class ConnectionManager:
+    # Coalescing flush interval (~60 Hz): fast enough that no one sees
+    # the batching, slow enough that a dragged slider costs one
+    # broadcast per interval instead of one per mousemove
+    COALESCE_INTERVAL = 0.016
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-    
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-    
+        # Sets make disconnects O(1) discards instead of O(N) list
+        # removals, and a vanished socket is a no-op rather than a
+        # ValueError when broadcast already dropped it
+        self.active_connections: Set[WebSocket] = set()
+        # Connections that negotiated the msgpack subprotocol; everyone
+        # else gets JSON frames
+        self.msgpack_connections: Set[WebSocket] = set()
+        # Newest pending update per source, drained by the flush task;
+        # values are message dicts or pre-encoded (json, msgpack) pairs
+        self._pending: Dict[str, object] = {}
+        self._flush_task = None
+
+    async def connect(self, websocket: WebSocket) -> bool:
+        """Accept the socket, negotiating msgpack framing if offered"""
+        use_msgpack = "msgpack" in websocket.scope.get("subprotocols", [])
+        await websocket.accept(subprotocol="msgpack" if use_msgpack else None)
+        self.active_connections.add(websocket)
+        if use_msgpack:
+            self.msgpack_connections.add(websocket)
+        return use_msgpack
+
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self.msgpack_connections.discard(websocket)
     
     async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(json.dumps(message))
-            except:
-                # Remove disconnected clients
-                self.active_connections.remove(connection)
+        # Serialize once per wire format: every client on a format gets
+        # the identical frame, so re-encoding per connection was O(N)
+        # wasted work. msgpack frames run ~30-50% smaller than the JSON
+        # equivalent for this payload (the rgb ints pack especially well).
+        if not self.active_connections:
+            return
+        json_frame = orjson.dumps(message)
+        msgpack_frame = (msgpack.packb(message, use_bin_type=True)
+                         if self.msgpack_connections else None)
+        await self.broadcast_raw(json_frame, msgpack_frame)
+
+    async def broadcast_raw(self, json_frame: bytes, msgpack_frame: bytes):
+        """Broadcast pre-encoded frames, skipping serialization entirely"""
+        # Iterate a snapshot so membership changes during the awaits
+        # can't race the fan-out; results line up with it positionally
+        connections = tuple(self.active_connections)
+        if not connections:
+            return
+        # Fan out concurrently so one slow socket doesn't serialize the
+        # whole broadcast, then drop failed sockets in a single post-pass
+        results = await asyncio.gather(
+            *(connection.send_bytes(
+                msgpack_frame if connection in self.msgpack_connections
+                else json_frame)
+              for connection in connections),
+            return_exceptions=True)
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.active_connections.discard(connection)
+                self.msgpack_connections.discard(connection)
+
+    def enqueue(self, message: dict):
+        """
+        Queue a color update for broadcast, coalescing bursts
+
+        Only the newest update per source is kept, so a slider emitting
+        dozens of changes per frame interval broadcasts once with the
+        final color. The flush task runs only while updates are
+        pending; an idle server schedules nothing.
+        """
+        self._pending[message.get("source", "")] = message
+        self._ensure_flush_task()
+
+    def enqueue_frames(self, source: str, json_frame: bytes,
+                       msgpack_frame: bytes):
+        """
+        Queue pre-encoded frames under the same coalescing rules
+
+        Presets go through here so they wait in line with any hex/rgb
+        update queued just before them; broadcasting them inline would
+        let a preset overtake the pending update and leave clients on
+        the stale color.
+        """
+        self._pending[source] = (json_frame, msgpack_frame)
+        self._ensure_flush_task()
+
+    def _ensure_flush_task(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_loop())
+
+    async def _flush_loop(self):
+        try:
+            # First flush goes out immediately so a lone update isn't
+            # delayed; only sustained bursts wait out the interval
+            while self._pending:
+                batch = self._pending
+                self._pending = {}
+                for item in batch.values():
+                    if isinstance(item, tuple):
+                        await self.broadcast_raw(*item)
+                    else:
+                        await self.broadcast(item)
+                await asyncio.sleep(self.COALESCE_INTERVAL)
+        finally:
+            self._flush_task = None
 
 manager = ConnectionManager()
 
@@ -53,79 +252,185 @@ PRESET_COLORS = {
 
 def hex_to_rgb(hex_color: str) -> dict:
     """Convert hex color to RGB values"""
-    hex_color = hex_color.lstrip('#')
-    if len(hex_color) == 3:
-        hex_color = ''.join([c*2 for c in hex_color])
-    
+    # One int() parse plus shifts/masks instead of three substring
+    # slices each parsed separately; a 3-digit code expands each nibble
+    # to a byte by multiplying with 0x11 (0xF * 0x11 == 0xFF)
+    h = hex_color.lstrip('#')
+    n = int(h, 16)
+    if len(h) == 3:
+        return {
+            "r": ((n >> 8) & 0xF) * 0x11,
+            "g": ((n >> 4) & 0xF) * 0x11,
+            "b": (n & 0xF) * 0x11
+        }
     return {
-        "r": int(hex_color[0:2], 16),
-        "g": int(hex_color[2:4], 16),
-        "b": int(hex_color[4:6], 16)
+        "r": (n >> 16) & 0xFF,
+        "g": (n >> 8) & 0xFF,
+        "b": n & 0xFF
     }
 
+# Preset colors are static, so their broadcast frames - both wire
+# formats - are fully encoded at import. A preset change then sends
+# cached bytes with no hex parsing or serialization on the hot path.
+PRESET_FRAMES = {
+    name: (orjson.dumps(frame), msgpack.packb(frame, use_bin_type=True))
+    for name, frame in (
+        (name, {"type": "color_update", "hex": hx,
+                "rgb": hex_to_rgb(hx), "source": "remote"})
+        for name, hx in PRESET_COLORS.items())
+}
+
+def _error_frames(message: str) -> tuple:
+    """JSON and msgpack encodings of an error payload, built at import"""
+    payload = {"error": message}
+    return orjson.dumps(payload), msgpack.packb(payload, use_bin_type=True)
+
+# The handful of distinct error replies are static, so their encoded
+# frames are built once; the error path then sends cached bytes instead
+# of allocating and encoding a dict per bad message
+ERR_INVALID_ENCODING = _error_frames("Invalid message encoding")
+ERR_INVALID_HEX = _error_frames("Invalid hex color format")
+ERR_INVALID_RGB = _error_frames("RGB values must be integers between 0-255")
+ERR_INVALID_TYPE = _error_frames("Invalid message type. Use 'hex', 'rgb', or 'preset'")
+ERR_UNKNOWN_PRESET = _error_frames(
+    f"Unknown preset color. Available: {list(PRESET_COLORS.keys())}")
+
+# Per-type validation handlers, dispatched by dict lookup instead of an
+# if/elif chain - one hash probe per message, and each handler stays
+# small enough to measure and tune on its own. They share a uniform
+# (color, r, g, b) signature so the dispatcher needs no per-type
+# argument plumbing.
+
+def _handle_hex(color, r, g, b) -> tuple:
+    # Validate the raw string first; the # normalization allocates, so
+    # only pay for it once the code is known good
+    if not is_hex_color(color):
+        return None, ERR_INVALID_HEX
+
+    if not color.startswith('#'):
+        color = "#" + color
+
+    return color, None
+
+def _handle_rgb(color, r, g, b) -> tuple:
+    # Deliberately plain Python: at one conversion per message, a
+    # jit-compiled kernel would spend more on per-call dispatch than
+    # this whole branch costs. Revisit only if a bulk endpoint ever
+    # feeds arrays through here.
+    # One bitwise test covers all three bounds (out-of-range values
+    # leave bits above 0xFF set); non-int junk raises TypeError on the
+    # | and lands in the same error
+    try:
+        out_of_range = (r | g | b) & ~0xFF
+    except TypeError:
+        out_of_range = True
+    if out_of_range:
+        return None, ERR_INVALID_RGB
+
+    return "#" + _HEX2[r] + _HEX2[g] + _HEX2[b], None
+
+def _handle_preset(color, r, g, b) -> tuple:
+    preset_name = color.lower()
+
+    if preset_name not in PRESET_COLORS:
+        return None, ERR_UNKNOWN_PRESET
+
+    return PRESET_COLORS[preset_name], None
+
+_HANDLERS = {
+    "hex": _handle_hex,
+    "rgb": _handle_rgb,
+    "preset": _handle_preset,
+}
+
+@lru_cache(maxsize=1024)
+def _validate_canonical(msg_type, color: str, r, g, b) -> tuple:
+    """
+    Pure validation core behind validate_and_process_color
+
+    Takes only hashable arguments so repeated identical messages (held
+    buttons, sliders at rest) resolve to a cached result instead of
+    re-running validation and hex formatting every time.
+    """
+    handler = _HANDLERS.get(msg_type)
+    if handler is None:
+        return None, ERR_INVALID_TYPE
+    return handler(color, r, g, b)
+
 def validate_and_process_color(message: dict) -> tuple:
-    """Validate and process color message, return (hex_color, error_dict)"""
+    """
+    Validate and process color message
+
+    Returns (hex_color, error), where error is None on success or one
+    of the pre-encoded (json, msgpack) error frame pairs.
+    """
     msg_type = message.get("type")
-    
-    if msg_type == "hex":
-        color = message.get("color", "")
-        if not color.startswith('#'):
-            color = f"#{color}"
-        
-        if not hex_pattern.match(color):
-            return None, {"error": "Invalid hex color format"}
-        
-        return color, None
-    
-    elif msg_type == "rgb":
-        r = message.get("r")
-        g = message.get("g")
-        b = message.get("b")
-        
-        if not all(isinstance(val, int) and 0 <= val <= 255 for val in [r, g, b]):
-            return None, {"error": "RGB values must be integers between 0-255"}
-        
-        color = f"#{r:02x}{g:02x}{b:02x}"
-        return color, None
-    
-    elif msg_type == "preset":
-        preset_name = message.get("color", "").lower()
-        
-        if preset_name == "random":
-            import random
-            color = f"#{random.randint(0, 16777215):06x}"
-            return color, None
-        
-        if preset_name not in PRESET_COLORS:
-            return None, {"error": f"Unknown preset color. Available: {list(PRESET_COLORS.keys())}"}
-        
-        return PRESET_COLORS[preset_name], None
-    
-    else:
-        return None, {"error": "Invalid message type. Use 'hex', 'rgb', or 'preset'"}
+
+    # The random preset is the one non-deterministic case, so it stays
+    # outside the cached core
+    if msg_type == "preset" and str(message.get("color", "")).lower() == "random":
+        # getrandbits(24) skips randint's range-reduction work; the
+        # three LUT lookups beat one :06x format for the same reason
+        # as the rgb branch
+        n = getrandbits(24)
+        return "#" + _HEX2[(n >> 16) & 0xFF] + _HEX2[(n >> 8) & 0xFF] + _HEX2[n & 0xFF], None
+
+    try:
+        return _validate_canonical(
+            msg_type, str(message.get("color", "")),
+            message.get("r"), message.get("g"), message.get("b"))
+    except TypeError:
+        # Unhashable values can't be cached, and can't be valid either
+        return None, ERR_INVALID_TYPE
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """
     WebSocket endpoint for real-time color changes
     """
-    await manager.connect(websocket)
+    use_msgpack = await manager.connect(websocket)
+    # Index into the (json, msgpack) frame pairs for this connection's
+    # negotiated wire format
+    fmt = 1 if use_msgpack else 0
     try:
         while True:
-            # Receive message from client
-            data = await websocket.receive_text()
-            
+            # Receive message from client in the negotiated format
             try:
-                message = json.loads(data)
-            except json.JSONDecodeError:
-                await websocket.send_text(json.dumps({"error": "Invalid JSON format"}))
+                if use_msgpack:
+                    message = msgpack.unpackb(
+                        await websocket.receive_bytes(), raw=False)
+                else:
+                    # Take the raw frame rather than receive_text():
+                    # orjson parses bytes directly, so binary senders
+                    # skip the UTF-8 decode to str entirely and text
+                    # senders still work
+                    data = await websocket.receive()
+                    if data["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(data.get("code", 1000))
+                    raw = data.get("bytes")
+                    message = orjson.loads(data["text"] if raw is None else raw)
+            except (ValueError, msgpack.exceptions.UnpackException):
+                await websocket.send_bytes(ERR_INVALID_ENCODING[fmt])
+                continue
+            if not isinstance(message, dict):
+                await websocket.send_bytes(ERR_INVALID_ENCODING[fmt])
                 continue
             
+            # Named presets skip validation and enqueue their
+            # pre-encoded frames; going through the same pending queue
+            # keeps broadcast order matching message order
+            if message.get("type") == "preset":
+                frames = PRESET_FRAMES.get(str(message.get("color", "")).lower())
+                if frames is not None:
+                    manager.enqueue_frames("remote", *frames)
+                    continue
+
             # Process the color change request
             hex_color, error = validate_and_process_color(message)
             
             if error:
-                await websocket.send_text(json.dumps(error))
+                # Errors are pre-encoded (json, msgpack) pairs
+                await websocket.send_bytes(error[fmt])
                 continue
             
             # Convert to RGB for response
@@ -139,44 +444,38 @@ async def websocket_endpoint(websocket: WebSocket):
                 "source": "remote"
             }
             
-            await manager.broadcast(response)
+            manager.enqueue(response)
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
 @app.get("/", response_class=HTMLResponse)
-async def root(request: Request):
+async def root():
     """
     Root endpoint that displays the default page
     """
-    return templates.TemplateResponse(
-        "index.html", 
-        {"request": request, "color": "#FFFFFF"}
-    )
+    return HTMLResponse(_WHITE_PAGE)
 
 @app.get("/color/{color_code}", response_class=HTMLResponse)
-async def display_color(request: Request, color_code: str):
+async def display_color(color_code: str):
     """
     Display a specific color fullscreen
     
     Args:
         color_code: Hex color code (with or without #)
     """
-    # Add # if missing
-    if not color_code.startswith('#'):
-        color_code = f"#{color_code}"
-    
-    # Validate the color code
-    if not hex_pattern.match(color_code):
+    # Validate the raw code first; the # normalization allocates, so
+    # only pay for it once the code is known good
+    if not is_hex_color(color_code):
         raise HTTPException(status_code=400, detail="Invalid color code. Please use a valid hex color (e.g., #FF0000 or #F00)")
-    
-    return templates.TemplateResponse(
-        "index.html", 
-        {"request": request, "color": color_code}
-    )
+
+    if not color_code.startswith('#'):
+        color_code = "#" + color_code
+
+    return render_color_page(color_code)
 
 @app.get("/rgb/{r}/{g}/{b}", response_class=HTMLResponse)
-async def display_rgb_color(request: Request, r: int, g: int, b: int):
+async def display_rgb_color(r: int, g: int, b: int):
     """
     Display a color based on RGB values
     
@@ -185,22 +484,42 @@ async def display_rgb_color(request: Request, r: int, g: int, b: int):
         g: Green component (0-255)
         b: Blue component (0-255)
     """
-    # Validate RGB values
-    for value, name in [(r, "red"), (g, "green"), (b, "blue")]:
-        if not 0 <= value <= 255:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid {name} value. Must be between 0 and 255."
-            )
-    
+    # Validate RGB values: any component outside [0, 255] leaves bits
+    # above 0xFF set, so one bitwise check covers all three
+    if (r | g | b) & ~0xFF:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid RGB value. Each component must be between 0 and 255."
+        )
+
     # Convert to hex
-    color_code = f"#{r:02x}{g:02x}{b:02x}"
-    
-    return templates.TemplateResponse(
-        "index.html", 
-        {"request": request, "color": color_code}
-    )
+    color_code = "#" + _HEX2[r] + _HEX2[g] + _HEX2[b]
+
+    return render_color_page(color_code)
 
 if __name__ == "__main__":
+    import os
+    import sys
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+
+    if os.environ.get("COLOR_API_RELOAD"):
+        # Dev mode: auto-reload needs the single stock worker
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True,
+                    ws_per_message_deflate=False)
+    else:
+        # uvloop is Linux/macOS only; elsewhere keep the stock asyncio
+        # loop and let httptools handle parsing
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop" if sys.platform != "win32" else "asyncio",
+            http="httptools",
+            ws="websockets",
+            # color_update frames are ~60-80 bytes; permessage-deflate
+            # costs a zlib call per connection per broadcast for no
+            # meaningful size win at that scale
+            ws_per_message_deflate=False,
+            workers=os.cpu_count(),
+            access_log=False,
+        )
@@ -1,11 +1,10 @@
 #!/usr/bin/env python3
 """
 EV3 Dashboard Launcher
-Simple script to launch the modern EV3 PyQt dashboard
+Simple script to launch the modern EV3 PySide6 dashboard
 """
 
 import sys
-import asyncio
 import logging
 from pathlib import Path
 
@@ -15,22 +14,22 @@ sys.path.insert(0, str(Path(__file__).parent))
 def check_requirements():
     """Check if all required packages are installed"""
     missing_packages = []
-    
+
     try:
-        import PyQt6
+        import PySide6
     except ImportError:
-        missing_packages.append("PyQt6")
-    
+        missing_packages.append("PySide6")
+
     try:
-        import qasync
+        import numpy
     except ImportError:
-        missing_packages.append("qasync")
-    
+        missing_packages.append("numpy")
+
     try:
         import pyqtgraph
     except ImportError:
         missing_packages.append("pyqtgraph")
-    
+
     try:
         import bleak
     except ImportError:
@@ -59,10 +58,12 @@ def main():
     print("🚀 Starting dashboard...")
     
     try:
-        # Import and run the dashboard
+        # Import and run the dashboard (QtAsyncio drives the event
+        # loop internally, so this is a plain synchronous call)
         from ev3_dashboard import main as dashboard_main
-        asyncio.run(dashboard_main())
-        
+        dashboard_main()
+
+
     except KeyboardInterrupt:
         print("\n👋 Dashboard closed by user")
     except ImportError as e:
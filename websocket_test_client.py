@@ -9,6 +9,14 @@ import websockets
 import json
 import time
 
+# Match the server's event loop where available so client-side timing
+# reflects uvloop's lower dispatch latency; harmless to skip elsewhere
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 async def test_websocket():
     uri = "ws://localhost:8000/ws"
     